@@ -0,0 +1,55 @@
+'''
+Benchmark: CIStringDict compared to dict for build, lookup, iteration and memory.
+
+Run from the repository root:
+    python notebooks/bench/bench_ardict.py
+'''
+
+import gc
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "..")))
+
+from tarkash.type.type import CIStringDict
+
+SIZE = 50000
+
+def memory(factory):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    obj = factory()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / 1024 / 1024
+
+def timed(stmt, number):
+    return min(timeit.repeat(stmt, number=number, repeat=3)) / number * 1e3
+
+if __name__ == "__main__":
+    source = {f"Key_{i}": i for i in range(SIZE)}
+    lookups = [f"KEY_{i}" for i in range(0, SIZE, 7)]
+    plain_lookups = [f"Key_{i}" for i in range(0, SIZE, 7)]
+    plain = dict(source)
+    cidict = CIStringDict(source)
+
+    rows = {
+        "build": (timed(lambda: dict(source), 10), timed(lambda: CIStringDict(source), 10)),
+        f"lookup x{len(lookups)}": (
+            timed(lambda: [plain[k] for k in plain_lookups], 10),
+            timed(lambda: [cidict[k] for k in lookups], 10),
+        ),
+        "iterate keys": (timed(lambda: [k for k in plain], 10), timed(lambda: [k for k in cidict], 10)),
+        "iterate items": (timed(lambda: [kv for kv in plain.items()], 10), timed(lambda: [kv for kv in cidict.items()], 10)),
+        "missing lookups": (
+            timed(lambda: [k in plain for k in lookups], 10),
+            timed(lambda: [k in cidict for k in (k + "_" for k in lookups)], 10),
+        ),
+    }
+    print(f"{SIZE} keys (ms)        {'dict':>10s} {'CIStringDict':>13s}")
+    for name, (p, c) in rows.items():
+        print(f"{name:22s} {p:10.2f} {c:13.2f}")
+    print(f"{'memory (MiB)':22s} {memory(lambda: dict(source)):10.2f} {memory(lambda: CIStringDict(source)):13.2f}")
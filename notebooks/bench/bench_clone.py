@@ -0,0 +1,44 @@
+'''
+Benchmark: cost of clone() for CIStringDict and OnceOnlyKeyCIStringDict, and memory held by many clones of a large dictionary.
+
+Run from the repository root:
+    python notebooks/bench/bench_clone.py
+'''
+
+import gc
+import os
+import sys
+import tempfile
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "..")))
+os.environ.setdefault("PROJECT_DIR", tempfile.mkdtemp())
+
+from tarkash import Tarkash
+from tarkash.type.type import CIStringDict, OnceOnlyKeyCIStringDict
+
+SIZE = 10000
+CLONES = 1000
+
+def clones_memory(d):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    clones = [d.clone() for _ in range(CLONES)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / 1024 / 1024
+
+if __name__ == "__main__":
+    Tarkash.init()
+    source = {f"Option_{i}": i for i in range(SIZE)}
+    print(f"{SIZE} keys{'':16s} {'clone (ms)':>12s} {'clone + 1 write (ms)':>21s} {f'{CLONES} clones (MiB)':>18s}")
+    for d in (CIStringDict(source), OnceOnlyKeyCIStringDict(source)):
+        clone = min(timeit.repeat(d.clone, number=10, repeat=3)) / 10 * 1e3
+
+        def clone_and_write():
+            d.clone()["New_Option"] = 1
+
+        write = min(timeit.repeat(clone_and_write, number=10, repeat=3)) / 10 * 1e3
+        print(f"{d.__class__.__name__:26s} {clone:12.3f} {write:21.3f} {clones_memory(d):18.2f}")
@@ -0,0 +1,73 @@
+'''
+Memory-per-instance benchmark: TarkashObject subclasses with and without __slots__ (compact mode).
+
+Run from the repository root:
+    python notebooks/bench/bench_compact.py
+'''
+
+import gc
+import os
+import sys
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "..")))
+os.environ.setdefault("PROJECT_DIR", tempfile.mkdtemp())
+# Keeps construction of File objects from writing debug records.
+os.environ.setdefault("LOG_FILE_LEVEL", "INFO")
+
+from tarkash import Tarkash, File
+from tarkash.core.tobj import TarkashObject
+from tarkash.type.descriptor import DString, DInt, DBoolean
+
+class Point(TarkashObject):
+    '''
+        A typical small subclass: three descriptors and one plain attribute.
+    '''
+    _label = DString(immutable=True)
+    _x = DInt()
+    _y = DInt()
+
+    def __init__(self, label, x, y, **kwargs):
+        super().__init__(**kwargs)
+        self._label = label
+        self._x = x
+        self._y = y
+        self._visible = True
+
+class CompactPoint(TarkashObject):
+    __slots__ = ("_visible",)
+
+    _label = DString(immutable=True)
+    _x = DInt()
+    _y = DInt()
+
+    def __init__(self, label, x, y, **kwargs):
+        super().__init__(**kwargs)
+        self._label = label
+        self._x = x
+        self._y = y
+        self._visible = True
+
+def per_instance(factory, number):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [factory(i) for i in range(number)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # Excludes the list holding the objects.
+    return (after - before - sys.getsizeof(objects)) / number
+
+NUMBER = 20000
+
+if __name__ == "__main__":
+    Tarkash.init()
+    results = {
+        "File": per_instance(lambda i: File(f"file_{i}.txt"), NUMBER),
+        "Point (dict)": per_instance(lambda i: Point(f"p{i}", i, i), NUMBER),
+        "Point (compact)": per_instance(lambda i: CompactPoint(f"p{i}", i, i), NUMBER),
+    }
+    print(f"{'':18s} {'bytes/instance':>15s}")
+    for k, v in results.items():
+        print(f"{k:18s} {v:15.1f}")
@@ -0,0 +1,61 @@
+'''
+Micro-benchmark: get/set cost of Tarkash descriptors compared to plain attributes.
+
+Run from the repository root:
+    python notebooks/bench/bench_descriptor.py
+'''
+
+import os
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "..")))
+os.environ.setdefault("PROJECT_DIR", tempfile.mkdtemp())
+
+from tarkash import Tarkash
+from tarkash.type.descriptor import DInt, DFloat, DString, DBoolean, DCallable
+
+class Plain:
+
+    def __init__(self):
+        self.i = 1
+        self.f = 1.0
+        self.s = "a"
+        self.b = True
+        self.c = str
+
+class Described:
+    i = DInt(minvalue=0, maxvalue=100)
+    f = DFloat(minvalue=0.0)
+    s = DString()
+    b = DBoolean()
+    c = DCallable()
+
+    def __init__(self):
+        self.i = 1
+        self.f = 1.0
+        self.s = "a"
+        self.b = True
+        self.c = str
+
+def bench(obj):
+    results = dict()
+    for name, value in (("i", 5), ("f", 2.5), ("s", "b"), ("b", False), ("c", int)):
+        results[name] = (
+            timeit.timeit(lambda: getattr(obj, name), number=NUMBER),
+            timeit.timeit(lambda: setattr(obj, name, value), number=NUMBER),
+        )
+    return results
+
+NUMBER = 1000000
+
+if __name__ == "__main__":
+    Tarkash.init()
+    plain = bench(Plain())
+    described = bench(Described())
+    print(f"{'':10s} {'plain get':>10s} {'desc get':>10s} {'plain set':>10s} {'desc set':>10s}  (ns)")
+    for k in plain:
+        pg, ps = (v / NUMBER * 1e9 for v in plain[k])
+        dg, ds = (v / NUMBER * 1e9 for v in described[k])
+        print(f"{k:10s} {pg:10.1f} {dg:10.1f} {ps:10.1f} {ds:10.1f}")
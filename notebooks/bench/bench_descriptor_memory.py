@@ -0,0 +1,58 @@
+'''
+Memory regression check: constructing and dropping a million File-like objects must not grow memory.
+
+Descriptors must not keep instances alive. Traced memory after the last batch is compared to the memory after the first batch.
+
+Run from the repository root:
+    python notebooks/bench/bench_descriptor_memory.py
+'''
+
+import gc
+import os
+import sys
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "..")))
+os.environ.setdefault("PROJECT_DIR", tempfile.mkdtemp())
+
+from tarkash import Tarkash
+from tarkash.core.tobj import TarkashObject
+from tarkash.type.descriptor import DString, DBoolean
+
+class FileLike(TarkashObject):
+    '''
+        Has the descriptors of File, without path resolution and its logging.
+    '''
+    _path = DString(immutable=True)
+    _try_relative_path = DBoolean(immutable=True)
+    _should_exist = DBoolean(immutable=True)
+
+    def __init__(self, path, *, should_exist=False, try_relative_path=True, **kwargs):
+        super().__init__(**kwargs)
+        self._path = path
+        self._should_exist = should_exist
+        self._try_relative_path = try_relative_path
+
+TOTAL = 1000000
+BATCH = 100000
+# Allowed growth between the first and the last batch.
+TOLERANCE = 1024 * 1024
+
+if __name__ == "__main__":
+    Tarkash.init()
+    tracemalloc.start()
+    baseline = None
+    for done in range(BATCH, TOTAL + 1, BATCH):
+        for i in range(BATCH):
+            FileLike(f"file_{i}.txt")
+        gc.collect()
+        current, peak = tracemalloc.get_traced_memory()
+        baseline = baseline is None and current or baseline
+        print(f"{done:8d} objects: current {current / 1024:10.1f} KiB, peak {peak / 1024:10.1f} KiB")
+    growth = current - baseline
+    print(f"Growth after the first batch: {growth / 1024:.1f} KiB")
+    if growth > TOLERANCE:
+        print("FAIL: memory grows with the number of objects constructed.")
+        sys.exit(1)
+    print("OK: memory is flat.")
@@ -0,0 +1,49 @@
+'''
+Benchmark: FrozenCIStringDict creation, hashing and use as a cache key, compared with building a cache key from a CIStringDict for each look-up.
+
+Run from the repository root:
+    python notebooks/bench/bench_frozen.py
+'''
+
+import functools
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "..")))
+
+from tarkash.type.type import CIStringDict, ProcessedKeyDict, FrozenCIStringDict
+
+SIZE = 1000
+NUMBER = 1000
+
+@functools.lru_cache(maxsize=None)
+def lookup(options):
+    return len(options)
+
+if __name__ == "__main__":
+    source = {f"Header_{i}": str(i) for i in range(SIZE)}
+    cidict = CIStringDict(source)
+    pkdict = ProcessedKeyDict(processor=str.strip, pydict=source)
+    frozen = cidict.freeze()
+    lookup(frozen)
+    lookup(frozenset(cidict.store.items()))
+
+    def timed(stmt):
+        return min(timeit.repeat(stmt, number=NUMBER, repeat=3)) / NUMBER * 1e6
+
+    def thaw_and_write():
+        frozen.thaw()["New_Header"] = "x"
+
+    rows = {
+        "freeze a CIStringDict": timed(cidict.freeze),
+        "freeze a ProcessedKeyDict": timed(lambda: FrozenCIStringDict(pkdict)),
+        "hash": timed(lambda: hash(frozen)),
+        "cached call, frozen key": timed(lambda: lookup(frozen)),
+        "cached call, key per call": timed(lambda: lookup(frozenset(cidict.store.items()))),
+        "thaw": timed(frozen.thaw),
+        "thaw + 1 write": timed(thaw_and_write),
+    }
+    print(f"{SIZE} keys{'':22s} {'us':>10s}")
+    for name, value in rows.items():
+        print(f"{name:32s} {value:10.2f}")
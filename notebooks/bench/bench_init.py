@@ -0,0 +1,52 @@
+'''
+Micro-benchmark: construction throughput of TarkashObject subclasses with a hand-written __init__ and with the __init__ generated for init=True.
+
+Run from the repository root:
+    python notebooks/bench/bench_init.py
+'''
+
+import os
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "..")))
+os.environ.setdefault("PROJECT_DIR", tempfile.mkdtemp())
+# Keeps construction of File objects from writing debug records.
+os.environ.setdefault("LOG_FILE_LEVEL", "INFO")
+
+from tarkash import Tarkash, File
+from tarkash.core.tobj import TarkashObject
+from tarkash.type.descriptor import DString, DInt, DBoolean
+
+class Point(TarkashObject):
+    _label = DString(immutable=True)
+    _x = DInt()
+    _y = DInt()
+    _visible = DBoolean()
+
+    def __init__(self, label, x, y, *, visible=True, **kwargs):
+        super().__init__(**kwargs)
+        self._label = label
+        self._x = x
+        self._y = y
+        self._visible = visible
+
+class GeneratedPoint(TarkashObject, init=True):
+    _label = DString(immutable=True)
+    _x = DInt()
+    _y = DInt()
+    _visible = DBoolean(default=True)
+
+NUMBER = 100000
+
+if __name__ == "__main__":
+    Tarkash.init()
+    results = {
+        "Point": timeit.timeit(lambda: Point("p", 1, 2), number=NUMBER),
+        "Point (init=True)": timeit.timeit(lambda: GeneratedPoint("p", 1, 2), number=NUMBER),
+        "File": timeit.timeit(lambda: File("x.txt"), number=NUMBER // 10) * 10,
+    }
+    print(f"{'':20s} {'us/object':>10s} {'objects/s':>12s}")
+    for k, v in results.items():
+        print(f"{k:20s} {v / NUMBER * 1e6:10.2f} {NUMBER / v:12.0f}")
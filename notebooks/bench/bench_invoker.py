@@ -0,0 +1,35 @@
+'''
+Micro-benchmark: invoker resolution with frame walking vs inspect.stack().
+
+Run from the repository root:
+    python notebooks/bench/bench_invoker.py
+'''
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "..")))
+
+from tarkash.track.stack import Stack
+
+def via_frames():
+    return Stack.get_invoker()
+
+def via_stack():
+    return Stack.get_invoker_from_stack()
+
+def caller(resolver):
+    return resolver()
+
+def nested(resolver, depth=20):
+    if depth == 0:
+        return caller(resolver)
+    return nested(resolver, depth - 1)
+
+if __name__ == "__main__":
+    assert caller(via_frames) == caller(via_stack), (caller(via_frames), caller(via_stack))
+    for label, stmt in (("shallow", lambda r: caller(r)), ("20 frames deep", lambda r: nested(r))):
+        for name, resolver, number in (("inspect.stack()", via_stack, 500), ("frame walk", via_frames, 200000)):
+            t = timeit.timeit(lambda: stmt(resolver), number=number)
+            print(f"{label:15s} {name:16s} {t / number * 1e6:10.2f} us/call")
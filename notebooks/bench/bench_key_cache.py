@@ -0,0 +1,42 @@
+'''
+Micro-benchmark: look-ups in ProcessedKeyDict and CIStringDict without a key cache, with a key cache, and with a key cache smaller than the set of keys looked up (with plain and NormalisedKey keys).
+
+Run from the repository root:
+    python notebooks/bench/bench_key_cache.py
+'''
+
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "..")))
+
+from tarkash.type.type import CIStringDict, ProcessedKeyDict
+
+__SEPARATORS = re.compile(r"[\s_\-.]+")
+
+def canonical_header(key):
+    # Regex-based canonicalisation, e.g. "Content_Type", "content-type" and "CONTENT TYPE" are the same key.
+    return __SEPARATORS.sub("-", key.strip()).lower()
+
+KEYS = 200
+NUMBER = 20
+
+if __name__ == "__main__":
+    source = {f"X-Header_Name {i}": i for i in range(KEYS)}
+    lookups = [f"X-HEADER_name {i}" for i in range(KEYS)] * 50
+    dicts = {
+        "ProcessedKeyDict": lambda size: ProcessedKeyDict(processor=canonical_header, pydict=source, key_cache_size=size),
+        "CIStringDict": lambda size: CIStringDict(source, key_cache_size=size),
+    }
+    print(f"{len(lookups)} look-ups of {KEYS} keys (ms)")
+    print(f"{'':18s} {'no cache':>10s} {'cache':>10s} {'small cache':>12s} {'small cache, NormalisedKey':>27s}")
+    for name, factory in dicts.items():
+        plain, cached, small = factory(0), factory(KEYS), factory(KEYS // 4)
+        normalised = [small.normalised_key(k) for k in lookups]
+        timings = [
+            min(timeit.repeat(lambda: [d[k] for k in keys], number=NUMBER, repeat=3)) / NUMBER * 1e3
+            for d, keys in ((plain, lookups), (cached, lookups), (small, lookups), (small, normalised))
+        ]
+        print(f"{name:18s} {timings[0]:10.2f} {timings[1]:10.2f} {timings[2]:12.2f} {timings[3]:27.2f}")
@@ -0,0 +1,62 @@
+'''
+Benchmark: throughput of multi-process logging into a single Tarkash.log.
+
+Each worker process initialises Tarkash and logs a fixed number of records, which are aggregated by the parent process.
+
+Run from the repository root:
+    python notebooks/bench/bench_multiprocess.py
+'''
+
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", ".."))
+sys.path.insert(0, ROOT_DIR)
+
+RECORDS_PER_WORKER = 2000
+
+def worker(n):
+    sys.path.insert(0, ROOT_DIR)
+    from tarkash import Tarkash, log_debug
+    Tarkash.init()
+    for i in range(RECORDS_PER_WORKER):
+        log_debug("Worker", n, "record", i)
+    if n == 0:
+        # A crashing worker must not affect the aggregator.
+        os._exit(1)
+    Tarkash.shutdown()
+
+def run(workers):
+    ctx = multiprocessing.get_context("spawn")
+    procs = [ctx.Process(target=worker, args=(n,)) for n in range(workers)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+
+if __name__ == "__main__":
+    project_dir = tempfile.mkdtemp()
+    os.environ["PROJECT_DIR"] = project_dir
+    os.environ["LOG_MULTIPROCESS"] = "true"
+    os.environ["LOG_CONSOLE_LEVEL"] = "WARNING"
+    from tarkash import Tarkash
+    Tarkash.init()
+    log_path = os.path.join(project_dir, "log", "tarkash.log")
+    for workers in (8, 16, 32):
+        before = sum(1 for _ in open(log_path, encoding="utf-8"))
+        start = time.perf_counter()
+        run(workers)
+        # Let the aggregator drain the sockets.
+        written = -1
+        while True:
+            time.sleep(0.5)
+            count = sum(1 for _ in open(log_path, encoding="utf-8")) - before
+            if count == written:
+                break
+            written = count
+        elapsed = time.perf_counter() - start
+        records = workers * RECORDS_PER_WORKER
+        print(f"{workers:3d} workers: {records} records sent, {written} written in {elapsed:.2f} s ({written / elapsed:,.0f} records/s incl. process start-up and drain)")
@@ -0,0 +1,67 @@
+'''
+Contention benchmark: threads setting the same keys of a shared OnceOnlyKeyCIStringDict and ConcurrentOnceOnlyKeyCIStringDict, and reading them.
+
+Every thread tries to set every key and then reads every key. Each key must be set by exactly one thread. More successful sets than keys means that a value meant to be immutable was overwritten.
+
+Run from the repository root:
+    python notebooks/bench/bench_once_only_contention.py
+'''
+
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "..")))
+os.environ.setdefault("PROJECT_DIR", tempfile.mkdtemp())
+# Keeps tracked dictionary methods from writing debug records.
+os.environ.setdefault("LOG_FILE_LEVEL", "INFO")
+
+from tarkash import Tarkash
+from tarkash.type.type import OnceOnlyKeyCIStringDict, ConcurrentOnceOnlyKeyCIStringDict
+
+KEYS = 2000
+READS = 5
+THREADS = (1, 2, 4, 8, 16, 32)
+
+def run(factory, threads):
+    d = factory()
+    keys = [f"Key_{i}" for i in range(KEYS)]
+    successes = [0] * threads
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(index):
+        # Each thread starts at a different key, so that threads collide on keys while they are being set.
+        own_keys = keys[index::threads] + keys
+        barrier.wait()
+        for k in own_keys:
+            try:
+                d[k] = index
+                successes[index] += 1
+            except Exception:
+                pass
+        for _ in range(READS):
+            for k in keys:
+                d[k]
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for w in workers:
+        w.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for w in workers:
+        w.join()
+    elapsed = time.perf_counter() - start
+    operations = threads * (KEYS + len(keys[0::threads]) + READS * KEYS)
+    return operations / elapsed, sum(successes)
+
+if __name__ == "__main__":
+    Tarkash.init()
+    # Frequent thread switches make check-then-act races likely.
+    sys.setswitchinterval(1e-6)
+    print(f"{KEYS} keys{'':30s} {'ops/s':>10s} {'successful sets':>16s}")
+    for factory in (OnceOnlyKeyCIStringDict, ConcurrentOnceOnlyKeyCIStringDict):
+        for threads in THREADS:
+            throughput, sets = run(factory, threads)
+            print(f"{factory.__name__:34s} {threads:2d} threads {throughput:10.0f} {sets:16d}")
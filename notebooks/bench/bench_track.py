@@ -0,0 +1,75 @@
+'''
+Micro-benchmark: call overhead of @track when its level is not emitted by any handler.
+
+Run from the repository root:
+    python notebooks/bench/bench_track.py
+'''
+
+import os
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "..")))
+os.environ.setdefault("PROJECT_DIR", tempfile.mkdtemp())
+
+from tarkash import Tarkash
+from tarkash.track.auto import track
+
+class Plain:
+
+    def method(self, a):
+        return a
+
+    @classmethod
+    def cmethod(cls, a):
+        return a
+
+    @staticmethod
+    def smethod(a):
+        return a
+
+    @property
+    def prop(self):
+        return 1
+
+class Tracked:
+
+    @track("trace")
+    def method(self, a):
+        return a
+
+    @track("trace")
+    @classmethod
+    def cmethod(cls, a):
+        return a
+
+    @track("trace")
+    @staticmethod
+    def smethod(a):
+        return a
+
+    @track("trace")
+    @property
+    def prop(self):
+        return 1
+
+def bench(obj):
+    return {
+        "method": timeit.timeit(lambda: obj.method(1), number=NUMBER),
+        "classmethod": timeit.timeit(lambda: obj.cmethod(1), number=NUMBER),
+        "staticmethod": timeit.timeit(lambda: obj.smethod(1), number=NUMBER),
+        "property": timeit.timeit(lambda: obj.prop, number=NUMBER),
+    }
+
+NUMBER = 1000000
+
+if __name__ == "__main__":
+    Tarkash.init()
+    plain = bench(Plain())
+    tracked = bench(Tracked())
+    print(f"{'':14s} {'plain ns':>10s} {'@track ns':>10s} {'overhead ns':>12s}")
+    for k in plain:
+        p = plain[k] / NUMBER * 1e9
+        t = tracked[k] / NUMBER * 1e9
+        print(f"{k:14s} {p:10.1f} {t:10.1f} {t - p:12.1f}")
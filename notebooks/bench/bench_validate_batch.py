@@ -0,0 +1,56 @@
+'''
+Micro-benchmark: validating a column with validate_batch compared to calling validate for each value.
+
+NumPy arrays are benchmarked too, if NumPy is installed.
+
+Run from the repository root:
+    python notebooks/bench/bench_validate_batch.py
+'''
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "..")))
+
+from tarkash.core.tobj import TarkashObject
+from tarkash.type.descriptor import DInt, DFloat
+
+class Row(TarkashObject):
+    _quantity = DInt(minvalue=0, maxvalue=1000)
+    _price = DFloat(minvalue=0.0)
+
+def one_by_one(descriptor, values):
+    offending = []
+    for index, value in enumerate(values):
+        try:
+            descriptor.validate(value)
+        except (TypeError, ValueError):
+            offending.append(index)
+    return offending
+
+ROWS = 100000
+
+if __name__ == "__main__":
+    quantities = [i % 1100 for i in range(ROWS)]
+    prices = [float(i % 50) - 1.0 for i in range(ROWS)]
+    columns = {"quantity": quantities, "price": prices}
+    try:
+        import numpy
+        # Elements of an int64 array are not ints and, as with validate, are type errors. Elements of a float64 array are floats.
+        arrays = {"quantity": numpy.array(quantities, dtype=object), "price": numpy.array(prices)}
+    except ImportError:
+        arrays = None
+
+    print(f"{ROWS} rows per column (ms)")
+    for name, values in columns.items():
+        descriptor = getattr(Row, "_" + name)
+        single = min(timeit.repeat(lambda: one_by_one(descriptor, values), number=1, repeat=3)) * 1e3
+        batch = min(timeit.repeat(lambda: descriptor.validate_batch(values), number=1, repeat=3)) * 1e3
+        line = f"{name:10s} validate: {single:8.1f}  validate_batch(list): {batch:8.1f}"
+        if arrays is not None:
+            array = arrays[name]
+            vectorized = min(timeit.repeat(lambda: descriptor.validate_batch(array), number=1, repeat=3)) * 1e3
+            line += f"  validate_batch(numpy): {vectorized:8.1f}"
+        print(line)
+    print(Row.validate_columns(columns)["quantity"])
@@ -31,6 +31,21 @@ class RefConfig:
                          "PROJECT_DIR": project_dir,
                          "LOG_CONSOLE_LEVEL": "INFO",
                          "LOG_FILE_LEVEL": "DEBUG",
+                         "LOG_ALLOWED_CONTEXTS": "",
+                         "LOG_ASYNC": False,
+                         "LOG_QUEUE_CAPACITY": 10000,
+                         "LOG_QUEUE_OVERFLOW": "block",
+                         "LOG_ROTATE_SIZE": 0,
+                         "LOG_ROTATE_INTERVAL": 0,
+                         "LOG_ROTATE_COMPRESS": True,
+                         "LOG_MULTIPROCESS": False,
+                         "LOG_JSON": False,
+                         "LOG_JSON_BATCH_SIZE": 200,
+                         "LOG_SAMPLING": "none",
+                         "LOG_TRACK_SAMPLING": "none",
+                         "LOG_SAMPLING_SUMMARY_INTERVAL": 60,
+                         "TRACK_CALL_STATS": False,
+                         "TRACE_DESCRIPTORS": False,
                          "LOG_DIR": f"{project_dir}/log",
                          "REPORT_DIR": f"{project_dir}/report",
         }
@@ -58,6 +58,48 @@ class TarkashOption(Enum):
     LOG_ALLOWED_CONTEXTS = auto()
     '''Allowed context strings for logging (file as well as display). Messages without contexts always get logged.'''
 
+    LOG_ASYNC = auto()
+    '''If True, log records are queued and written to console and log file by a background writer thread. Default is False.'''
+
+    LOG_QUEUE_CAPACITY = auto()
+    '''Maximum number of records in the asynchronous log queue. Default is 10000.'''
+
+    LOG_QUEUE_OVERFLOW = auto()
+    '''Behaviour when the asynchronous log queue is full: block/drop_oldest/drop_new. Default is block.'''
+
+    LOG_ROTATE_SIZE = auto()
+    '''Size in bytes, or with KB/MB/GB suffix, at which Tarkash.log is rolled over. Default is 0, which disables size-based rotation.'''
+
+    LOG_ROTATE_INTERVAL = auto()
+    '''Number of seconds after which Tarkash.log is rolled over. Default is 0, which disables time-based rotation.'''
+
+    LOG_ROTATE_COMPRESS = auto()
+    '''If True, rolled over log segments are gzip compressed on a background thread. Default is True.'''
+
+    LOG_MULTIPROCESS = auto()
+    '''If True, the first process which initialises Tarkash writes Tarkash.log and aggregates records sent by its child processes over a local socket. Default is False.'''
+
+    LOG_JSON = auto()
+    '''If True, log records are also written as one JSON object per line to tarkash.jsonl in LOG_DIR. Default is False.'''
+
+    LOG_JSON_BATCH_SIZE = auto()
+    '''Number of JSON lines buffered before they are written to tarkash.jsonl. Records of ERROR and higher levels are written immediately. Default is 200.'''
+
+    LOG_SAMPLING = auto()
+    '''Sampling spec for log_* calls, applied per invoker: every:N, rate:P, bucket:R or none. Default is none.'''
+
+    LOG_TRACK_SAMPLING = auto()
+    '''Default sampling spec for callables tracked with @track, applied per callable. Default is none.'''
+
+    LOG_SAMPLING_SUMMARY_INTERVAL = auto()
+    '''Minimum number of seconds between two summary records of suppressed records for a sampler. Default is 60.'''
+
+    TRACK_CALL_STATS = auto()
+    '''If True, wall clock and CPU time of every call of callables tracked with @track is recorded. Default is False.'''
+
+    TRACE_DESCRIPTORS = auto()
+    '''If True, every get and set of a Tarkash descriptor (DString, DInt etc.) is logged at trace level. Default is False.'''
+
     L10N_LOCALE = auto()
     '''Default Locale type to be used for Localization call. Values as per Tarkash.tpi.constant.Locale'''
 
@@ -18,43 +18,281 @@
 from abc import ABC, abstractmethod
 from tarkash.track.log import log_trace
 
+# Marks a descriptor without a default value.
+_MISSING = object()
+
 class _Descriptor(ABC):
+    '''
+        Base class of Tarkash's validating data descriptors.
+
+        The value is stored in the instance under the private name, or in a slot of the owner class if it declares __slots__ (see **slot_name**). Its presence is the marker that the attribute has been assigned, so an immutable attribute can be set only once without the descriptor holding references to instances.
+
+        Get and set are not traced, unless descriptor tracing is switched on with **enable_tracing** (TRACE_DESCRIPTORS option). Checks of a descriptor are compiled into a single validator function on first use.
+    '''
+    # Class-level switch, so that the check in __get__/__set__ is a single attribute look-up.
+    _TRACING = False
+
+    def __init__(self, *, default=_MISSING):
+        self.default = default
+
+    @property
+    def has_default(self) -> bool:
+        '''
+            True if a default value is provided. Used by the generated __init__ of TarkashObject subclasses.
+        '''
+        return self.default is not _MISSING
 
-    def __set_name__(self, owner, name, immutable=False):
+    @staticmethod
+    def slot_name(name: str) -> str:
+        '''
+            Name of the slot which stores the value of a descriptor assigned to the given class attribute name.
+
+            Arguments:
+                name: Name of the class attribute.
+        '''
+        return name + '_slot'
+
+    def __set_name__(self, owner, name):
         self.original_name = name
         self.private_name = '_' + name
-        self._immutable = immutable
-        self._assigned = set()
+        # Slot (member descriptor) of the owner or its bases, if any. Else the value is stored in __dict__ of the instance.
+        self._slot = None
+        slot_name = self.slot_name(name)
+        for klass in owner.__mro__:
+            member = klass.__dict__.get(slot_name)
+            if member is not None:
+                self._slot = member
+                break
+        # Set by __init__ of the sub-class.
+        self._immutable = getattr(self, "_immutable", False)
+        # Compiled here, after __init__ of the sub-class has set the checks.
+        self._compiled_validator = self._compile_validator()
+
+    @classmethod
+    def enable_tracing(cls, enabled: bool=True):
+        '''
+            Switches tracing of get/set of all descriptors on or off.
+
+            Arguments:
+                enabled: If True, every get and set is logged with **log_trace**.
+        '''
+        _Descriptor._TRACING = enabled
 
     def __get__(self, obj, objtype=None):
-        log_trace(f'__get__ called with obj={repr(obj)}, objtype={objtype}')
-        return obj.__dict__[self.private_name]
+        if obj is None:
+            return self
+        if _Descriptor._TRACING:
+            log_trace(f'__get__ called with obj={repr(obj)}, objtype={objtype}')
+        slot = self._slot
+        if slot is None:
+            return obj.__dict__[self.private_name]
+        return slot.__get__(obj, objtype)
 
     def __set__(self, obj, value):
-        log_trace(f'__set__ called with obj={repr(obj)}, value={value}')
+        if _Descriptor._TRACING:
+            log_trace(f'__set__ called with obj={repr(obj)}, value={value}')
+        slot = self._slot
+        if self._immutable and self.__is_assigned(obj, slot):
+            raise AttributeError(f'{self.original_name} is immutable')
         try:
-            if self._immutable and obj in self._assigned:
-                raise AttributeError(f'{self.original_name} is immutable')
-            self.validate(value)
+            self._compiled_validator(value)
         except TypeError as e:
             raise TypeError(f'{self.original_name}: {e}')
-        obj.__dict__[self.private_name] = value
-        self._assigned.add(obj)
-        #setattr(obj, self.private_name, value)
-        #self.__data[obj] = value
+        if slot is None:
+            obj.__dict__[self.private_name] = value
+        else:
+            slot.__set__(obj, value)
+
+    def __is_assigned(self, obj, slot):
+        if slot is None:
+            return self.private_name in obj.__dict__
+        try:
+            slot.__get__(obj)
+        except AttributeError:
+            return False
+        return True
+
+    @property
+    def _validator(self):
+        '''
+            Validator function compiled from checks of this descriptor. Compiled once and cached on the descriptor, when it is assigned to a class or on first use.
+        '''
+        try:
+            return self.__dict__["_compiled_validator"]
+        except KeyError:
+            validator = self.__dict__["_compiled_validator"] = self._compile_validator()
+            return validator
+
+    def _compile_validator(self):
+        '''
+            Returns a function which validates a value. Sub-classes override it to return a specialised function.
+        '''
+        return self.validate
 
     @abstractmethod
     def validate(self, value):
         pass
+
+    def validate_batch(self, values) -> "ValidationReport":
+        '''
+            Validates a column of values and reports offending row indices, instead of raising on the first invalid value.
+
+            Descriptors with type and range checks (DInt, DFloat, DNumber, DString, DBoolean) check a column in a single pass. A NumPy array whose elements pass the type check, e.g. of dtype float64 for DFloat, is checked with vectorized comparisons. As with **validate**, elements of dtypes such as int64 or bool_, which are not ints or bools, are type errors. NumPy is not required otherwise.
+
+            Arguments:
+                values: A sequence (e.g. list or tuple) or a one-dimensional NumPy array.
+        '''
+        field = getattr(self, "original_name", self.__class__.__name__)
+        spec = getattr(self._validator, "spec", None)
+        if spec is not None:
+            return _validate_batch_with_spec(field, values, *spec)
+        # Generic path: errors of the validator are classified by exception type.
+        validator = self._validator
+        type_errors, value_errors = [], []
+        for index, value in enumerate(values):
+            try:
+                validator(value)
+            except TypeError:
+                type_errors.append(index)
+            except ValueError:
+                value_errors.append(index)
+        return ValidationReport(field, len(values), type_errors, value_errors=value_errors)
     
     def _raise_type_error(self, value, expected):
         raise TypeError(f'{self.__class__.__name__}Descriptor got >>{value}<< of type >>{type(value)}<<, but expected >>{expected}<<')
+
+class ValidationReport:
+    '''
+        Result of **validate_batch** for a column of values.
+
+        Arguments:
+            field: Name of the validated field.
+            count: Number of validated values.
+            type_errors: Row indices of values of an unexpected type.
+            below_min: Row indices of values below the minimum.
+            above_max: Row indices of values above the maximum.
+            value_errors: Row indices of values which failed other checks.
+    '''
+    __slots__ = ("field", "count", "type_errors", "below_min", "above_max", "value_errors")
+
+    # Maximum number of indices per category shown by __str__.
+    _SHOWN = 10
+
+    def __init__(self, field, count, type_errors=(), below_min=(), above_max=(), value_errors=()):
+        self.field = field
+        self.count = count
+        self.type_errors = tuple(type_errors)
+        self.below_min = tuple(below_min)
+        self.above_max = tuple(above_max)
+        self.value_errors = tuple(value_errors)
+
+    @property
+    def ok(self) -> bool:
+        '''
+            True if all values are valid.
+        '''
+        return not (self.type_errors or self.below_min or self.above_max or self.value_errors)
+
+    @property
+    def offending(self) -> tuple:
+        '''
+            Sorted row indices of all invalid values.
+        '''
+        return tuple(sorted(set(self.type_errors).union(self.below_min, self.above_max, self.value_errors)))
+
+    def as_dict(self) -> dict:
+        return {k: getattr(self, k) for k in self.__slots__}
+
+    def __str__(self):
+        if self.ok:
+            return f"{self.field}: all {self.count} value(s) are valid."
+        parts = [f"{self.field}: {len(self.offending)} of {self.count} value(s) are invalid."]
+        for label, indices in (("Type", self.type_errors), ("Below min", self.below_min), ("Above max", self.above_max), ("Other", self.value_errors)):
+            if indices:
+                shown = ", ".join(str(i) for i in indices[:self._SHOWN])
+                parts.append(f"{label}: [{shown}{len(indices) > self._SHOWN and ', ...' or ''}]")
+        return " ".join(parts)
+
+    def __repr__(self):
+        return f"ValidationReport({self})"
+
+def _validate_batch_with_spec(field, values, types, minvalue, maxvalue):
+    if values.__class__.__module__ == "numpy" and getattr(values, "ndim", None) == 1:
+        # Elements of the array are instances of the scalar type of its dtype, e.g. numpy.float64 (a float) or numpy.int64 (not an int). They are checked as **validate** checks them.
+        if issubclass(values.dtype.type, types):
+            import numpy
+            below = minvalue is not None and numpy.flatnonzero(values < minvalue).tolist() or ()
+            above = maxvalue is not None and numpy.flatnonzero(values > maxvalue).tolist() or ()
+            return ValidationReport(field, len(values), (), below, above)
+        if values.dtype.kind != "O":
+            # No element of the array is of the expected type.
+            return ValidationReport(field, len(values), range(len(values)))
+        values = values.tolist()
+    if minvalue is None and maxvalue is None:
+        return ValidationReport(field, len(values), [i for i, v in enumerate(values) if not isinstance(v, types)])
+    type_errors, below, above = [], [], []
+    # A single pass. Values of a wrong type are not compared with the bounds.
+    for index, value in enumerate(values):
+        if not isinstance(value, types):
+            type_errors.append(index)
+        elif minvalue is not None and value < minvalue:
+            below.append(index)
+        elif maxvalue is not None and value > maxvalue:
+            above.append(index)
+    return ValidationReport(field, len(values), type_errors, below, above)
+
+def _compile_type_and_range_check(descriptor, types, expected, minvalue=None, maxvalue=None):
+    '''
+        Builds a validator for an isinstance check followed by optional lower and upper bound checks. Only the checks which apply are included in the returned function.
+
+        Arguments:
+            descriptor: The descriptor whose type error is raised.
+            types: A type or tuple of types as per **isinstance**.
+            expected: Description of the expected type used in the error message.
+            minvalue: (Optional) Minimum allowed value.
+            maxvalue: (Optional) Maximum allowed value.
+    '''
+    raise_type_error = descriptor._raise_type_error
+
+    def below_min(value):
+        raise ValueError(f'Expected {value!r} to be at least {minvalue!r}')
+
+    def above_max(value):
+        raise ValueError(f'Expected {value!r} to be no more than {maxvalue!r}')
+
+    if minvalue is None and maxvalue is None:
+        def check(value):
+            if not isinstance(value, types):
+                raise_type_error(value, expected)
+    elif maxvalue is None:
+        def check(value):
+            if not isinstance(value, types):
+                raise_type_error(value, expected)
+            if value < minvalue:
+                below_min(value)
+    elif minvalue is None:
+        def check(value):
+            if not isinstance(value, types):
+                raise_type_error(value, expected)
+            if value > maxvalue:
+                above_max(value)
+    else:
+        def check(value):
+            if not isinstance(value, types):
+                raise_type_error(value, expected)
+            if value < minvalue:
+                below_min(value)
+            if value > maxvalue:
+                above_max(value)
+    # Lets generated code inline the checks, see _generate_init in tarkash.core.tobj.
+    check.spec = (types, minvalue, maxvalue)
+    return check
   
   
 class DTarkashObject(_Descriptor):
 
-    def __init__(self, *, immutable=False):
-        super().__init__()
+    def __init__(self, *, immutable=False, default=_MISSING):
+        super().__init__(default=default)
         self._immutable = immutable
 
     def validate(self, value):
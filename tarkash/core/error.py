@@ -36,11 +36,19 @@ class TarkashError(Exception):
             trace_messages (List[str]): List of trace messages to be displayed. They are flattened and appended to the message.
     """
     def __init__(self, tobj: TarkashObject, message: str):            
-        from tarkash.str.utils import append_dot
-        traces = " ".join([append_dot(m.strip()) for m in tobj.traces if m.strip()])
-        if traces:
-            traces = "Additional Info: " + traces
-        super().__init__(f"{tobj.class_name}::{tobj.object_name}:: {message} {traces}")
+        self.__traces = tobj.traces
+        self.__rendered = None
+        super().__init__(f"{tobj.class_name}::{tobj.object_name}:: {message}")
+
+    def __str__(self):
+        # Traces are flattened only when the message is rendered.
+        if self.__rendered is None:
+            from tarkash.str.utils import append_dot
+            traces = " ".join([append_dot(m.strip()) for m in self.__traces if m.strip()])
+            if traces:
+                traces = "Additional Info: " + traces
+            self.__rendered = f"{super().__str__()} {traces}"
+        return self.__rendered
 
 
 class CorruptStateError(TarkashError):
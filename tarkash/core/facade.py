@@ -16,6 +16,7 @@
 # limitations under the License.
 
 import os, sys
+import atexit
 from tarkash.core.adv.decorator import singleton
 
 @singleton
@@ -44,10 +45,31 @@ class _TarkashSingleton:
         
         from tarkash.track.log import _Logger
         self.__logger = _Logger(self.__ref_config)
+
+        from tarkash.core.constant import TarkashOption
+        from tarkash.track.log import _as_bool
+        from tarkash.track.stats import CallStats
+        CallStats.configure(enabled=_as_bool(self.__ref_config.value(TarkashOption.TRACK_CALL_STATS)))
+        atexit.register(self.dump_call_stats)
+        from tarkash.core.descriptor import _Descriptor
+        _Descriptor.enable_tracing(_as_bool(self.__ref_config.value(TarkashOption.TRACE_DESCRIPTORS)))
         
     @property
     def logger(self):
         return self.__logger.logger
+
+    def shutdown(self):
+        self.dump_call_stats()
+        self.__logger.shutdown()
+
+    def get_call_stats(self):
+        from tarkash.track.stats import CallStats
+        return CallStats.get()
+
+    def dump_call_stats(self):
+        from tarkash.core.constant import TarkashOption
+        from tarkash.track.stats import CallStats
+        return CallStats.dump(self.__ref_config.value(TarkashOption.REPORT_DIR))
     
     def get_option_value(self, option_name):
         return self.__ref_config.value(option_name)
@@ -84,6 +106,24 @@ class Tarkash:
         '''
         return cls._TWrapper().logger
     
+    @classmethod
+    def shutdown(cls):
+        '''
+            Writes call statistics to REPORT_DIR, writes pending log records and closes the log handlers.
+        '''
+        cls._TWrapper().shutdown()
+
+    @classmethod
+    def get_call_stats(cls):
+        '''
+            Latency statistics of tracked callables, as a dict of qualified name -> {"count", "wall", "cpu"}.
+
+            "wall" and "cpu" contain count, mean, min, p50, p90, p99 and max durations in nanoseconds. Statistics are recorded for callables tracked with **@track(stats=True)**, or for all tracked callables if TRACK_CALL_STATS option is True.
+
+            They are also written to call_stats.json in REPORT_DIR at exit or on **Tarkash.shutdown()**.
+        '''
+        return cls._TWrapper().get_call_stats()
+
     @classmethod
     def get_option_value(cls, enum_option):
         '''
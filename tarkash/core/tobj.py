@@ -17,19 +17,251 @@
 
 from __future__ import annotations
 
+import inspect
+import threading
+
 from tarkash.type.descriptor import *
+from tarkash.core.trace import TraceStore, TracePolicy
 from typing import List, Dict, Any
-from abc import ABC
+from abc import ABC, ABCMeta
+from tarkash.core.descriptor import _Descriptor, ValidationReport
+
+class _TarkashObjectMeta(ABCMeta):
+    '''
+        Adds storage slots for descriptors of classes which declare __slots__ and generates __init__ for classes declared with **init=True**.
+
+        A subclass opts into compact mode by declaring __slots__ with its plain attributes. A slot is added for each descriptor declared in the class body, unless a base class already provides it, so that descriptor values are stored in slots as well.
+
+        A subclass declared as **class Point(TarkashObject, init=True)** gets an __init__ generated from its descriptors (see **_generate_init**), unless it defines __init__ itself.
+    '''
+
+    def __new__(mcls, name, bases, namespace, init=False, **kwargs):
+        if "__slots__" in namespace:
+            slots = namespace["__slots__"]
+            slots = isinstance(slots, str) and (slots,) or tuple(slots)
+            inherited = set()
+            for base in bases:
+                for klass in base.__mro__:
+                    base_slots = klass.__dict__.get("__slots__", ())
+                    inherited.update(isinstance(base_slots, str) and (base_slots,) or base_slots)
+            extra = tuple(
+                _Descriptor.slot_name(attr) for attr, value in namespace.items() 
+                if isinstance(value, _Descriptor) and _Descriptor.slot_name(attr) not in slots and _Descriptor.slot_name(attr) not in inherited
+            )
+            namespace["__slots__"] = slots + extra
+        cls = super().__new__(mcls, name, bases, namespace, **kwargs)
+        if init and "__init__" not in namespace:
+            cls.__init__ = _generate_init(cls)
+        return cls
+
+def _check_field(field, validator, value):
+    try:
+        validator(value)
+    except TypeError as e:
+        raise TypeError(f'{field}: {e}')
+
+def _generate_init(cls):
+    '''
+        Generates __init__ of a TarkashObject subclass from its descriptors, in the manner of dataclasses.
+
+        Each descriptor declared by the class or its bases (other than TarkashObject) becomes a parameter, named without leading underscores, in the order of declaration. Parameters of descriptors with a default are keyword-only. Remaining keyword arguments are passed to __init__ of the base class.
+
+        If __init__ of the base class is generated as well, fields of the base class are passed to it by keyword and it validates and assigns them. Fields whose descriptors the class redeclares are validated and assigned again, with the redeclared descriptors.
+
+        If __init__ of the base class is hand-written (e.g. FlatFile), inherited fields which it names as parameters are passed to it by keyword, with the base's defaults. Other inherited fields are left to the base __init__ and can be passed as keyword arguments.
+
+        The generated __init__ validates all arguments with the compiled validators of the descriptors before assigning any of them, and then assigns them directly to their storage, without going through __set__. If the class defines __post_init__, it is called at the end.
+    '''
+    fields = dict()
+    for klass in reversed(cls.__mro__):
+        if klass is TarkashObject or not isinstance(klass, _TarkashObjectMeta):
+            continue
+        for attr, value in klass.__dict__.items():
+            if isinstance(value, _Descriptor):
+                fields[attr] = value
+    # Sub-classes can redeclare a descriptor. The one resolved for the class is used.
+    fields = {attr: getattr(cls, attr) for attr in fields}
+
+    names = dict()
+    for attr in fields:
+        param = attr.lstrip("_")
+        if not param.isidentifier() or param in {"self", "kwargs", "object_name"}:
+            raise TypeError(f"Cannot generate __init__ for {cls.__qualname__}: descriptor {attr} does not map to a valid parameter name.")
+        if param in names:
+            raise TypeError(f"Cannot generate __init__ for {cls.__qualname__}: descriptors {names[param]} and {attr} both map to parameter >>{param}<<.")
+        names[param] = attr
+
+    base_init = super(cls, cls).__init__
+    # Fields which the generated __init__ of the base class validates and assigns.
+    base_fields = getattr(base_init, "_fields", dict())
+    # Named parameters of a hand-written __init__ of the base class.
+    base_params = None
+    if base_init is not TarkashObject.__init__ and getattr(base_init, "_fields_init", None) is None:
+        base_params = {
+            name: p for name, p in list(inspect.signature(base_init).parameters.items())[1:]
+            if p.kind in (inspect.Parameter.POSITIONAL_OR_KEYWORD, inspect.Parameter.KEYWORD_ONLY)
+        }
+    params, kw_params, checks, stores, forwarded = [], [], [], [], []
+    # Parameter -> descriptor, for the fields which are parameters of the generated __init__.
+    init_fields = dict()
+    env = {"__cls": cls, "__check": _check_field}
+    for index, (attr, descriptor) in enumerate(fields.items()):
+        param = attr.lstrip("_")
+        if base_params is not None and attr not in cls.__dict__:
+            if param not in base_params:
+                continue
+            init_fields[param] = descriptor
+            forwarded.append(f"{param}={param}")
+            if base_params[param].default is inspect.Parameter.empty:
+                params.append(param)
+            else:
+                env[f"__d{index}"] = base_params[param].default
+                kw_params.append(f"{param}=__d{index}")
+            continue
+        init_fields[param] = descriptor
+        if base_params is not None and param in base_params:
+            forwarded.append(f"{param}={param}")
+        if descriptor.has_default:
+            env[f"__d{index}"] = descriptor.default
+            kw_params.append(f"{param}=__d{index}")
+        else:
+            params.append(param)
+        if param in base_fields:
+            forwarded.append(f"{param}={param}")
+            if base_fields[param] is descriptor:
+                continue
+        validator = env[f"__v{index}"] = descriptor._validator
+        spec = getattr(validator, "spec", None)
+        if spec is None:
+            checks.append(f"    __check({attr!r}, __v{index}, {param})")
+        else:
+            # Type and range checks are inlined. The validator runs only to raise the error.
+            types, minvalue, maxvalue = spec
+            env[f"__t{index}"] = types
+            condition = [f"not isinstance({param}, __t{index})"]
+            if minvalue is not None:
+                env[f"__min{index}"] = minvalue
+                condition.append(f"{param} < __min{index}")
+            if maxvalue is not None:
+                env[f"__max{index}"] = maxvalue
+                condition.append(f"{param} > __max{index}")
+            checks += [f"    if {' or '.join(condition)}:", f"        __check({attr!r}, __v{index}, {param})"]
+        if descriptor._slot is None:
+            stores.append(f"    __dict[{descriptor.private_name!r}] = {param}")
+        else:
+            env[f"__s{index}"] = descriptor._slot.__set__
+            stores.append(f"    __s{index}(self, {param})")
+
+    # If the base __init__ is that of TarkashObject, its work is inlined for the common case of no trace options.
+    inline_base = base_init is TarkashObject.__init__
+    if inline_base:
+        kw_params.append('object_name="NOT_SET"')
+        env["__set_class_name"] = TarkashObject.__dict__["_class_name"]._slot.__set__
+        env["__base_init"] = TarkashObject.__init__
+    signature = ", ".join(["self"] + params + (kw_params and ["*"] + kw_params or []) + ["**kwargs"])
+    lines = [f"def __init__({signature}):"]
+    lines += checks
+    if inline_base:
+        lines += [
+            "    if kwargs:",
+            "        __base_init(self, object_name, **kwargs)",
+            "    else:",
+            "        __set_class_name(self, self.__module__ + '.' + self.__class__.__name__)",
+            "        self._object_name = object_name",
+            "        self._traces = None",
+        ]
+    elif getattr(base_init, "_fields_init", None) is not None:
+        # Without calling __post_init__, which is called once, at the end of this __init__.
+        env["__base_fields_init"] = base_init._fields_init
+        lines.append(f"    __base_fields_init(self, {', '.join(forwarded + ['**kwargs'])})")
+    else:
+        lines.append(f"    super(__cls, self).__init__({', '.join(forwarded + ['**kwargs'])})")
+    if any(line.startswith("    __dict[") for line in stores):
+        lines.append("    __dict = self.__dict__")
+    lines += stores
+    # The same __init__ without the call of __post_init__, for __init__ generated for subclasses.
+    fields_lines = ["def __fields_init" + lines[0][len("def __init__"):]] + lines[1:]
+    if hasattr(cls, "__post_init__"):
+        lines.append("    self.__post_init__()")
+    source = "\n".join(lines)
+    # Wrapped in a factory so that entries of env are closure variables of __init__.
+    factory = "def __create({}):\n{}\n{}\n    return __init__, __fields_init".format(
+        ", ".join(env), "\n".join("    " + line for line in lines), "\n".join("    " + line for line in fields_lines)
+    )
+    namespace = dict()
+    exec(factory, {}, namespace)
+    init, fields_init = namespace["__create"](**env)
+    init.__qualname__ = f"{cls.__qualname__}.__init__"
+    init.__module__ = cls.__module__
+    init.__doc__ = f"Generated from descriptors: {', '.join(init_fields) or 'none'}."
+    init._source = source
+    init._fields = init_fields
+    init._fields_init = fields_init
+    return init
+
+class TarkashObject(ABC, metaclass=_TarkashObjectMeta):
+    '''
+        Base class of Tarkash objects.
+
+        Subclasses which declare __slots__ (compact mode) store their attributes, including values of descriptors, in slots instead of a per-instance dict. Subclasses without __slots__ work as before.
+    '''
+    # TarkashObject itself is compact, so that its fields do not need a per-instance dict.
+    __slots__ = ("_object_name", "_traces", "__weakref__")
 
-class TarkashObject(ABC):
     _object_name: DString()
     _class_name: str = DString()
 
-    def __init__(self, object_name:str = "NOT_SET", **kwargs):
+    # Defaults for the bounded trace store. Subclasses can override them.
+    _TRACE_CAPACITY = 100
+    _TRACE_POLICY = TracePolicy.RECENT
+    # Guards lazy creation of trace stores.
+    __TRACES_LOCK = threading.Lock()
+
+    def __init__(self, object_name:str = "NOT_SET", *, trace_capacity: int=None, trace_policy: TracePolicy=None, **kwargs):
         self._class_name = self.__module__ + "." + self.__class__.__name__
         self._object_name = object_name
-        self._traces = []
+        if trace_capacity is None and trace_policy is None:
+            # Created on the first trace message, as most objects are never traced.
+            self._traces = None
+        else:
+            self._traces = TraceStore(
+                trace_capacity is None and self._TRACE_CAPACITY or trace_capacity, 
+                trace_policy is None and self._TRACE_POLICY or trace_policy
+            )
+
+    def __trace_store(self):
+        traces = self._traces
+        if traces is None:
+            with TarkashObject.__TRACES_LOCK:
+                traces = self._traces
+                if traces is None:
+                    traces = self._traces = TraceStore(self._TRACE_CAPACITY, self._TRACE_POLICY)
+        return traces
         
+    @classmethod
+    def validate_columns(cls, columns: Dict[str, Any]) -> Dict[str, ValidationReport]:
+        """
+        Validates columns of values against descriptors of the class, e.g. rows of a data file, without constructing objects.
+
+        Args:
+            columns (dict): Field name -> column (a list, tuple or one-dimensional NumPy array). Field names are descriptor names with or without leading underscores, as in the generated __init__.
+
+        Returns:
+            dict: Field name -> **ValidationReport** with the offending row indices.
+        """
+        reports = dict()
+        for name, values in columns.items():
+            descriptor = None
+            for attr in (name, "_" + name.lstrip("_")):
+                candidate = getattr(cls, attr, None)
+                if isinstance(candidate, _Descriptor):
+                    descriptor = candidate
+                    break
+            if descriptor is None:
+                raise AttributeError(f"{cls.__qualname__} has no descriptor for field >>{name}<<.")
+            reports[name] = descriptor.validate_batch(values)
+        return reports
+
     @property
     def object_name(self) -> str:
         """
@@ -48,8 +280,11 @@ class TarkashObject(ABC):
     def traces(self) -> List[str]:
         """
         Trace messages associated with the object.
+        
+        At most trace_capacity messages are retained, as per trace_policy.
         """
-        return tuple(self._traces)
+        traces = self._traces
+        return traces is None and () or traces.messages()
 
     @property
     def meta(self) -> Dict[str, Any]:
@@ -62,16 +297,10 @@ class TarkashObject(ABC):
         }
 
     def _format_properties_str(self, props_dict: Dict[str, Any]) -> str:
-        obj_props = ""
-        for k, v in props_dict.items():
-            k = k.title()
-            obj_props += f"{k}: {v}\n"
-        return obj_props
+        return "".join([f"{k.title()}: {v}\n" for k, v in props_dict.items()])
 
     def __str__(self) -> str:
-        obj_props = "Object Properties:\n"
-        obj_props += self._format_properties_str(self.meta)
-        return obj_props
+        return "Object Properties:\n" + self._format_properties_str(self.meta)
 
     @staticmethod
     def merge_properties(tobj:TarkashObject, props_dict: Dict[str, Any]) -> Dict[str, Any]:
@@ -80,11 +309,12 @@ class TarkashObject(ABC):
         """
         return {**tobj.meta, **props_dict}
     
-    def append_trace(self, message):
+    def append_trace(self, message, level=0):
         """
         Append a trace message to the object.
         
         Args:
             message (str): Message
+            level (int): Numeric log level of the message.
         """
-        self._traces.append(message)
+        self.__trace_store().append(message, level)
@@ -0,0 +1,100 @@
+# This file is a part of Tarkash
+# Copyright 2015-2024 Rahul Verma
+
+# Website: www.RahulVerma.net
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#   http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+from collections import deque
+from enum import Enum, auto
+from typing import Tuple
+
+class TracePolicy(Enum):
+    '''
+        Decides which trace messages a **TraceStore** retains when it is full.
+    '''
+
+    RECENT = auto()
+    '''The oldest message is discarded.'''
+
+    RELEVANT = auto()
+    '''The oldest message with the lowest log level is discarded.'''
+
+
+class TraceStore:
+    '''
+        Bounded, thread-safe store of trace messages for a TarkashObject.
+
+        Arguments:
+            capacity: Maximum number of retained messages.
+            policy: A **TracePolicy** constant. Default is TracePolicy.RECENT.
+    '''
+    # A store is created for every TarkashObject, so it is kept small: slots, and no container till the first message.
+    __slots__ = ("__capacity", "__policy", "__lock", "__entries", "__discarded")
+
+    def __init__(self, capacity: int=100, policy: TracePolicy=TracePolicy.RECENT):
+        if type(capacity) is not int or capacity < 1:
+            raise ValueError(f"Trace capacity should be a positive int. Got >>{capacity}<<.")
+        self.__capacity = capacity
+        self.__policy = policy
+        self.__lock = threading.Lock()
+        self.__entries = ()
+        self.__discarded = 0
+
+    @property
+    def capacity(self) -> int:
+        return self.__capacity
+
+    @property
+    def policy(self) -> TracePolicy:
+        return self.__policy
+
+    @property
+    def discarded(self) -> int:
+        '''
+            Number of messages discarded because the store was full.
+        '''
+        return self.__discarded
+
+    def append(self, message: str, level: int=0):
+        '''
+            Append a message.
+
+            Args:
+                message: Trace message.
+                level: Numeric log level of the message. Used by TracePolicy.RELEVANT.
+        '''
+        with self.__lock:
+            entries = self.__entries
+            if entries.__class__ is tuple:
+                if self.__policy is TracePolicy.RECENT:
+                    entries = self.__entries = deque(maxlen=self.__capacity)
+                else:
+                    entries = self.__entries = []
+            if len(entries) >= self.__capacity:
+                self.__discarded += 1
+                if self.__policy is TracePolicy.RELEVANT:
+                    lowest = min(range(len(entries)), key=lambda i: entries[i][0])
+                    del entries[lowest]
+            entries.append((level, message))
+
+    def messages(self) -> Tuple[str]:
+        '''
+            Retained messages in the order of appending.
+        '''
+        with self.__lock:
+            return tuple(m for _, m in self.__entries)
+
+    def __len__(self):
+        return len(self.__entries)
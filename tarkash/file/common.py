@@ -17,6 +17,8 @@
 
 import os
 import re
+import stat
+import time
 from typing import List, Dict, Any, Optional
 
 from tarkash.core.tobj import TarkashObject
@@ -24,10 +26,17 @@ from tarkash.type.descriptor import *
 from tarkash import log_debug
 from abc import ABC
 
-class File(TarkashObject): 
+class File(TarkashObject, init=True): 
+    # Compact mode: values of the descriptors below are stored in slots as well.
+    __slots__ = ("_exists", "_relative", "_full_path", "_meta_cache")
+
+    # Seconds for which filesystem-derived fields of meta (is_file, exists) are cached. 0 disables caching. Subclasses can override it.
+    _META_TTL = 1.0
+
+    # __init__(self, path, *, try_relative_path=True, should_exist=False, **kwargs) is generated from these descriptors.
     _path = DString(immutable=True)
-    _try_relative_path = DBoolean(immutable=True)
-    _should_exist = DBoolean(immutable=True)
+    _try_relative_path = DBoolean(immutable=True, default=True)
+    _should_exist = DBoolean(immutable=True, default=False)
     
     """
     
@@ -44,17 +53,14 @@ class File(TarkashObject):
     In addition to the above, you can pass the keyword arguments supported by TarkashObject e.g. name.
     """
     
-    def __init__(self, path: str, *, should_exist: bool=False, try_relative_path: bool=True, **kwargs):
+    def __post_init__(self):
         """
-        Initializes the FlatFileReader with the provided file path and try_relative_path flag.
+        Resolves the full path after the generated __init__ has validated and assigned path, should_exist and try_relative_path.
         """
-        super().__init__(**kwargs)
-        self._path = path
-        self._should_exist = should_exist
-        self._try_relative_path = try_relative_path
         self._exists = False
         self._relative = False
         self._full_path = "NOT_SET"
+        self._meta_cache = None
         self.__determine_file_path()
         self._validate_file_or_dir()
         
@@ -144,8 +150,8 @@ class File(TarkashObject):
             1. If defined, from PROJECT_DIR environment variable.
             2. Current working directory.
         """
-        if os.environ.get("PROJECT_DIR"):
-            base_path = os.environ.get("PROJECT_DIR")
+        base_path = os.environ.get("PROJECT_DIR")
+        if base_path:
             log_debug(f"Found PROJECT_DIR environment variable with value: {base_path}.", tobj=self)
         else:
             base_path = os.getcwd()
@@ -208,17 +214,36 @@ class File(TarkashObject):
     def meta(self) -> dict:
         """
         Properties of the object as a dictionary.
+
+        The dictionary is built lazily and cached. Filesystem-derived fields (is_file, exists) come from a single stat call, which is repeated only after _META_TTL seconds or after **refresh_meta()**.
         """
+        cache = self._meta_cache
+        if cache is None or time.monotonic() - cache[0] >= self._META_TTL:
+            try:
+                exists, is_file = True, stat.S_ISREG(os.stat(self._full_path).st_mode)
+            except (OSError, ValueError):
+                exists, is_file = False, False
+            props = TarkashObject.merge_properties(super(), {
+                "path": self.path,
+                "full_path": self.full_path,
+                "has_relative_path": self.has_relative_path,
+                "is_file": is_file,
+                "should_exist": self.should_exist,
+                "exists": exists
+            })
+            cache = self._meta_cache = (time.monotonic(), props)
+        # A copy, so that changes made by the caller do not leak into the cache.
+        return dict(cache[1])
+
+    def refresh_meta(self) -> dict:
+        """
+        Discards cached meta, e.g. after the file is created or deleted, and returns fresh meta.
         
-        props = TarkashObject.merge_properties(super(), {
-            "path": self.path,
-            "full_path": self.full_path,
-            "has_relative_path": self.has_relative_path,
-            "is_file": self.is_file,
-            "should_exist": self.should_exist,
-            "exists": self.exists
-        })
-        return props
+        Returns:
+            dict: Properties of the object.
+        """
+        self._meta_cache = None
+        return self.meta
     
     @property
     def mime_type(self) -> str:
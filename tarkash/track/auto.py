@@ -37,9 +37,16 @@ import os
 import sys
 import types
 import inspect
+import time
 import functools
+import reprlib
+import collections
 
 from tarkash.object.utils import get_class_for_method
+from tarkash.track import log
+from tarkash.track.log import LazyMessage
+from tarkash.track.sample import SamplingPolicy
+from tarkash.track.stats import CallStats
 
 prop_dict_msg = {
     "fget": ("(Getting Property)","", " Returning: {}"),
@@ -47,8 +54,32 @@ prop_dict_msg = {
     "fdel": ("(Deleting Property)","", ""),
 }
 
+def __bounded_repr(max_len):
+    r = reprlib.Repr()
+    r.maxlevel = 3
+    r.maxtuple = r.maxlist = r.maxarray = r.maxdict = r.maxset = r.maxfrozenset = r.maxdeque = 30
+    r.maxstring = r.maxother = r.maxlong = max_len
+    return r
+
+__REPRS = {}
+__CONTAINER_TYPES = (list, tuple, dict, set, frozenset, collections.deque)
+
 def trim_arg(arg, max_len=300):
-    arg = str(arg)
+    '''
+        String representation of an argument, truncated to max_len characters.
+
+        Strings and bytes are sliced before conversion and built-in containers are rendered with bounded depth and width, so the full string is not built for large values. Other objects are converted with str() and then truncated, so their full string is built, unless their __str__ bounds it (as pandas and NumPy do as per their display options).
+    '''
+    if isinstance(arg, str):
+        arg = arg[0:max_len + 1]
+    elif isinstance(arg, (bytes, bytearray)):
+        arg = str(bytes(arg[0:max_len + 1]))
+    elif isinstance(arg, __CONTAINER_TYPES):
+        if max_len not in __REPRS:
+            __REPRS[max_len] = __bounded_repr(max_len)
+        arg = __REPRS[max_len].repr(arg)
+    else:
+        arg = str(arg)
     return len(arg) > max_len and arg[0:max_len] + "<SNIP>" or arg
 
 def trim_args(args):
@@ -60,14 +91,32 @@ def trim_kwargs(kwargs):
 def trim_ret_value(ret):
     return trim_arg(ret, max_len=200)
 
-def func_wrapper(func, level, *vargs, static=False, prop=False, prop_type="fget", **kwargs):
-    import Tarkash
-    from Tarkash import log_error
+class _Deferred:
+    '''
+        Applies the renderer to the value only when formatted into a log message.
+    '''
+    __slots__ = ("renderer", "value")
+
+    def __init__(self, renderer, value):
+        self.renderer = renderer
+        self.value = value
+
+    def __format__(self, format_spec):
+        return format(str(self.renderer(self.value)), format_spec)
+
+def resolve_level(func, level):
+    '''
+        Level at which calls of the callable are tracked. Private and protected callables are tracked at **trace** level.
+    '''
     name = func.__name__
-    qualname = func.__qualname__
     if name not in {"__init__", "__getattr__"}:
         level = name.startswith("_") and "trace" or level
-    log_call = getattr(Tarkash, "log_{}".format(level.strip().lower()))
+    return level.strip().lower()
+
+def func_wrapper(func, level, *vargs, static=False, prop=False, prop_type="fget", **kwargs):
+    name = func.__name__
+    qualname = func.__qualname__
+    log_call = getattr(log, "log_{}".format(level))
     if name != qualname and not static:
         pvargs = vargs[1:]
     else:
@@ -75,33 +124,213 @@ def func_wrapper(func, level, *vargs, static=False, prop=False, prop_type="fget"
 
     if prop:
         msg_1 = prop_dict_msg[prop_type][0]
-        msg_2 = prop_dict_msg[prop_type][1].format(pvargs, kwargs)
-        log_call("{} {}{}".format(qualname, msg_1, msg_2))
+        msg_2 = prop_dict_msg[prop_type][1]
+        log_call(LazyMessage("{} {}" + msg_2, qualname, msg_1, _Deferred(trim_args, pvargs), _Deferred(trim_kwargs, kwargs)))
     elif name == "__getattr__":
         log_call("{} Dynamic attr retrieval.".format(qualname.replace("__getattr__", pvargs[0])))
     else:
-        log_call("{}:: Started with args {} and kwargs {}.".format(qualname, trim_args(pvargs), trim_kwargs(kwargs)))
+        log_call(LazyMessage("{}:: Started with args {} and kwargs {}.", qualname, _Deferred(trim_args, pvargs), _Deferred(trim_kwargs, kwargs)))
     ret = None
     try:
         ret = func(*vargs, **kwargs)
     except Exception as e:
-        import traceback
-        log_call("{}:: Exception: {}.".format(qualname, e))
+        log_call(LazyMessage("{}:: Exception: {}.", qualname, e))
 
         # Same exception should be raised else it WILL cause error-dependent-logic error
         raise e
     else:
         if prop:
-            msg_1 = prop_dict_msg[prop_type][0]
-            msg_3 = prop_dict_msg[prop_type][2].format(ret)
-            log_call("{}:: Finished.{}".format(qualname, msg_3, msg_3))
+            msg_3 = prop_dict_msg[prop_type][2]
+            log_call(LazyMessage("{}:: Finished." + msg_3, qualname, _Deferred(trim_ret_value, ret)))
         elif name == "__getattr__":
-            log_call("{} Dynamic attr value: {}.".format(qualname.replace("__getattr__", pvargs[0]), trim_ret_value(ret)))
+            log_call(LazyMessage("{} Dynamic attr value: {}.", qualname.replace("__getattr__", pvargs[0]), _Deferred(trim_ret_value, ret)))
         else:
-            log_call("{}:: Finished. Returning: {}".format(qualname, trim_ret_value(ret)))
+            log_call(LazyMessage("{}:: Finished. Returning: {}", qualname, _Deferred(trim_ret_value, ret)))
         return ret
 
-def track_func(level="debug", static=False, prop=False, prop_type="fget"):
+async def coroutine_wrapper(func, level, *vargs, static=False, timed=False, **kwargs):
+    '''
+        Tracks a call of a coroutine function. The call is finished when the coroutine completes, not when the coroutine object is created.
+    '''
+    qualname = func.__qualname__
+    log_call = getattr(log, "log_{}".format(level))
+    if func.__name__ != qualname and not static:
+        pvargs = vargs[1:]
+    else:
+        pvargs = vargs
+    log_call(LazyMessage("{}:: Started with args {} and kwargs {}.", qualname, _Deferred(trim_args, pvargs), _Deferred(trim_kwargs, kwargs)))
+    clock = timed and _StepClock(qualname) or None
+    try:
+        if clock:
+            ret = await _timed_steps(func(*vargs, **kwargs), clock)
+        else:
+            ret = await func(*vargs, **kwargs)
+    except Exception as e:
+        log_call(LazyMessage("{}:: Exception: {}.", qualname, e))
+        raise e
+    finally:
+        clock and clock.stop()
+    log_call(LazyMessage("{}:: Finished. Returning: {}", qualname, _Deferred(trim_ret_value, ret)))
+    return ret
+
+def generator_wrapper(func, level, *vargs, static=False, timed=False, track_calls=True, **kwargs):
+    '''
+        Tracks a call of a generator function. Items are passed on as they are yielded and counted, without being collected.
+
+        Values sent to and exceptions thrown into the wrapper are passed on to the generator.
+    '''
+    qualname = func.__qualname__
+    log_call = getattr(log, "log_{}".format(level))
+    if func.__name__ != qualname and not static:
+        pvargs = vargs[1:]
+    else:
+        pvargs = vargs
+    if track_calls:
+        log_call(LazyMessage("{}:: Started with args {} and kwargs {}.", qualname, _Deferred(trim_args, pvargs), _Deferred(trim_kwargs, kwargs)))
+    clock = timed and _StepClock(qualname) or None
+    gen = func(*vargs, **kwargs)
+    count = 0
+    value, exc = None, None
+    try:
+        while True:
+            clock and clock.resume()
+            try:
+                if exc is None:
+                    item = gen.send(value)
+                else:
+                    item = gen.throw(exc)
+            except StopIteration as stop:
+                ret = stop.value
+                break
+            finally:
+                clock and clock.pause()
+            count += 1
+            value, exc = None, None
+            try:
+                value = yield item
+            except GeneratorExit:
+                gen.close()
+                track_calls and log_call(LazyMessage("{}:: Closed after yielding {} item(s).", qualname, count))
+                raise
+            except BaseException as e:
+                exc = e
+    except Exception as e:
+        track_calls and log_call(LazyMessage("{}:: Exception after yielding {} item(s): {}.", qualname, count, e))
+        raise e
+    finally:
+        clock and clock.stop()
+    track_calls and log_call(LazyMessage("{}:: Finished. Yielded {} item(s). Returning: {}", qualname, count, _Deferred(trim_ret_value, ret)))
+    return ret
+
+async def async_generator_wrapper(func, level, *vargs, static=False, timed=False, track_calls=True, **kwargs):
+    '''
+        Tracks a call of an asynchronous generator function. Items are passed on as they are yielded and counted, without being collected.
+    '''
+    qualname = func.__qualname__
+    log_call = getattr(log, "log_{}".format(level))
+    if func.__name__ != qualname and not static:
+        pvargs = vargs[1:]
+    else:
+        pvargs = vargs
+    if track_calls:
+        log_call(LazyMessage("{}:: Started with args {} and kwargs {}.", qualname, _Deferred(trim_args, pvargs), _Deferred(trim_kwargs, kwargs)))
+    clock = timed and _StepClock(qualname) or None
+    agen = func(*vargs, **kwargs)
+    count = 0
+    value, exc = None, None
+    try:
+        while True:
+            if exc is None:
+                step = agen.asend(value)
+            else:
+                step = agen.athrow(exc)
+            try:
+                if clock:
+                    item = await _timed_steps(step, clock)
+                else:
+                    item = await step
+            except StopAsyncIteration:
+                break
+            count += 1
+            value, exc = None, None
+            try:
+                value = yield item
+            except GeneratorExit:
+                await agen.aclose()
+                track_calls and log_call(LazyMessage("{}:: Closed after yielding {} item(s).", qualname, count))
+                raise
+            except BaseException as e:
+                exc = e
+    except Exception as e:
+        track_calls and log_call(LazyMessage("{}:: Exception after yielding {} item(s): {}.", qualname, count, e))
+        raise e
+    finally:
+        clock and clock.stop()
+    track_calls and log_call(LazyMessage("{}:: Finished. Yielded {} item(s).", qualname, count))
+
+class _StepClock:
+    '''
+        Measures a call whose execution is split into steps, such as resumptions of a generator or coroutine.
+
+        Wall clock time runs from creation to **stop**. CPU time is the sum of thread CPU time of the steps, so that time spent by other tasks of the event loop, or by the consumer of a generator, is not counted.
+    '''
+    __slots__ = ("qualname", "wall", "cpu", "step_start", "stopped")
+
+    def __init__(self, qualname):
+        self.qualname = qualname
+        self.wall = time.perf_counter_ns()
+        self.cpu = 0
+        self.step_start = None
+        self.stopped = False
+
+    def resume(self):
+        self.step_start = time.thread_time_ns()
+
+    def pause(self):
+        self.cpu += time.thread_time_ns() - self.step_start
+
+    def stop(self):
+        if not self.stopped:
+            self.stopped = True
+            CallStats.record(self.qualname, time.perf_counter_ns() - self.wall, self.cpu)
+
+@types.coroutine
+def _timed_steps(awaitable, clock):
+    '''
+        Awaits the awaitable, step by step, adding CPU time of each step to the clock.
+    '''
+    it = awaitable.__await__()
+    value, exc = None, None
+    while True:
+        clock.resume()
+        try:
+            if exc is None:
+                future = it.send(value)
+            else:
+                future = it.throw(exc)
+        except StopIteration as stop:
+            return stop.value
+        finally:
+            clock.pause()
+        value, exc = None, None
+        try:
+            value = yield future
+        except GeneratorExit:
+            it.close()
+            raise
+        except BaseException as e:
+            exc = e
+
+def _log_suppressed(log_call, qualname, policy, suppressed):
+    log_call("{}:: Sampling ({}) suppressed tracking of {} call(s).".format(qualname, policy.spec, suppressed))
+
+# Tracked calls are sampled per callable, not per invoker.
+log._UNSAMPLED_CODES.update({
+    func_wrapper.__code__, coroutine_wrapper.__code__, generator_wrapper.__code__, 
+    async_generator_wrapper.__code__, _log_suppressed.__code__
+})
+
+def track_func(level="debug", static=False, prop=False, prop_type="fget", sample=None, stats=False):
 
     def dec(func):
         fname = func.__name__
@@ -110,27 +339,119 @@ def track_func(level="debug", static=False, prop=False, prop_type="fget"):
                 func._wrapped = True
             elif func._wrapped:
                 return func
+        func_level = resolve_level(func, level)
+        levelno = log._LEVEL_NUMBERS[func_level]
+        policy = SamplingPolicy.parse(sample)
+        # (Re)created on an emitted call after sampling configuration is (re)loaded, as the configured default policy is known only after Tarkash is initialised.
+        sampler = None
+        sampling_version = -1
+        qualname = func.__qualname__
+
+        def sampled():
+            nonlocal sampler, sampling_version
+            if sampling_version != log._SAMPLING_VERSION:
+                sampling = policy or log._TRACK_SAMPLING
+                sampler = sampling and sampling.new_sampler(log._SAMPLING_SUMMARY_INTERVAL) or None
+                sampling_version = log._SAMPLING_VERSION
+                if sampler:
+                    log._SAMPLING_SUMMARIES.register(
+                        sampler, 
+                        functools.partial(_log_suppressed, getattr(log, "log_{}".format(func_level)), qualname, sampling), 
+                        log._SAMPLING_SUMMARY_INTERVAL
+                    )
+            if sampler:
+                allowed, suppressed = sampler.sample()
+                if suppressed:
+                    _log_suppressed(getattr(log, "log_{}".format(func_level)), qualname, policy or log._TRACK_SAMPLING, suppressed)
+                return allowed
+            return True
+
+        # Coroutines, generators and asynchronous generators are wrapped natively, so that logging and timing cover their execution rather than creation of the coroutine or generator object, and the wrappers are recognised by inspect as what they wrap. The tracking decision is therefore made when execution starts.
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def ainner(*vargs, **kwargs):
+                timed = stats or CallStats._ENABLED
+                if levelno < log._EMIT_LEVEL or not sampled():
+                    if not timed:
+                        return await func(*vargs, **kwargs)
+                    clock = _StepClock(qualname)
+                    try:
+                        return await _timed_steps(func(*vargs, **kwargs), clock)
+                    finally:
+                        clock.stop()
+                return await coroutine_wrapper(func, func_level, *vargs, static=static, timed=timed, **kwargs)
+            return ainner
+        elif inspect.isasyncgenfunction(func):
+            @functools.wraps(func)
+            async def aginner(*vargs, **kwargs):
+                timed = stats or CallStats._ENABLED
+                track_calls = levelno >= log._EMIT_LEVEL and sampled()
+                if not (timed or track_calls):
+                    agen = func(*vargs, **kwargs)
+                else:
+                    agen = async_generator_wrapper(func, func_level, *vargs, static=static, timed=timed, track_calls=track_calls, **kwargs)
+                # There is no "yield from" for asynchronous generators, so sent values, thrown exceptions and closing are passed on explicitly.
+                value, exc = None, None
+                while True:
+                    try:
+                        if exc is None:
+                            item = await agen.asend(value)
+                        else:
+                            item = await agen.athrow(exc)
+                    except StopAsyncIteration:
+                        return
+                    value, exc = None, None
+                    try:
+                        value = yield item
+                    except GeneratorExit:
+                        await agen.aclose()
+                        raise
+                    except BaseException as e:
+                        exc = e
+            return aginner
+        elif inspect.isgeneratorfunction(func):
+            @functools.wraps(func)
+            def ginner(*vargs, **kwargs):
+                timed = stats or CallStats._ENABLED
+                track_calls = levelno >= log._EMIT_LEVEL and sampled()
+                if not (timed or track_calls):
+                    return (yield from func(*vargs, **kwargs))
+                return (yield from generator_wrapper(func, func_level, *vargs, static=static, timed=timed, track_calls=track_calls, **kwargs))
+            return ginner
+
+        @functools.wraps(func)
+        def timed(*vargs, **kwargs):
+            wall, cpu = time.perf_counter_ns(), time.thread_time_ns()
+            try:
+                return func(*vargs, **kwargs)
+            finally:
+                CallStats.record(qualname, time.perf_counter_ns() - wall, time.thread_time_ns() - cpu)
+
         @functools.wraps(func)
         def inner(*vargs, **kwargs):
-            return func_wrapper(func, level, *vargs, static=static, prop=prop, prop_type=prop_type, **kwargs)
+            target = (stats or CallStats._ENABLED) and timed or func
+            # Pass-through when no handler emits the level. Re-checked on every call, so level changes take effect immediately.
+            if levelno < log._EMIT_LEVEL or not sampled():
+                return target(*vargs, **kwargs)
+            return func_wrapper(target, func_level, *vargs, static=static, prop=prop, prop_type=prop_type, **kwargs)
         return inner
 
     return dec
 
-def wrap_methods(cls, level): #, *args, **kwargs):
+def wrap_methods(cls, level, sample=None, stats=False): #, *args, **kwargs):
     for attr_name, attr in vars(cls).items():
         if type(attr) is types.FunctionType:
-            setattr(cls, attr_name, track_func(level)(attr))
+            setattr(cls, attr_name, track_func(level, sample=sample, stats=stats)(attr))
         elif isinstance(attr, classmethod):
-            setattr(cls, attr_name, classmethod(track_func(level)(attr.__func__)))
+            setattr(cls, attr_name, classmethod(track_func(level, sample=sample, stats=stats)(attr.__func__)))
         elif isinstance(attr, staticmethod):
-            setattr(cls, attr_name, staticmethod(track_func(level, static=True)(attr.__func__)))
+            setattr(cls, attr_name, staticmethod(track_func(level, static=True, sample=sample, stats=stats)(attr.__func__)))
 
-def track_class(cls, level):
-    wrap_methods(cls, level)
+def track_class(cls, level, sample=None, stats=False):
+    wrap_methods(cls, level, sample=sample, stats=stats)
     return cls
 
-def track(level: str="debug"):
+def track(level: str="debug", *, sample: str=None, stats: bool=False):
     '''
         Decorator to track a callable.
 
@@ -144,6 +465,8 @@ def track(level: str="debug"):
         Keywrod Arguments:
             callable: Callable that is decorated.
             level: (Optional) A string representing a Logging Level (trace/debug/info/warning/error/fatal). Default is debug.
+            sample: (Optional) Sampling spec for tracked calls of each callable: every:N, rate:P, bucket:R or none. Default is as per LOG_TRACK_SAMPLING option.
+            stats: (Optional) If True, wall clock and CPU time of each call is recorded in latency histograms, irrespective of the logging level. Default is False. TRACK_CALL_STATS option enables this for all tracked callables. See **Tarkash.get_call_stats()**.
 
         Note:
             When you decorate a class with @track, it automatically tracks its construction, all its methods including classmethods and staticmethods.
@@ -155,6 +478,8 @@ def track(level: str="debug"):
             You can selectively add decorators to methods in the class as well.
 
             @track also works for functions.
+
+            Coroutine functions, generator functions and asynchronous generator functions are tracked till the coroutine completes or the generator is exhausted or closed. Yielded items are counted, not collected.
     '''
 
     kallable = None
@@ -186,18 +511,18 @@ def track(level: str="debug"):
 
     def deco(kallable):
         if inspect.isclass(kallable):
-            return track_class(kallable, level)
+            return track_class(kallable, level, sample=sample, stats=stats)
         elif inspect.isfunction(kallable) or inspect.ismethod(kallable):
-            return track_func(level)(kallable)
+            return track_func(level, sample=sample, stats=stats)(kallable)
         elif isinstance(kallable, classmethod):
-            return classmethod(track_func(level)(kallable.__func__))
+            return classmethod(track_func(level, sample=sample, stats=stats)(kallable.__func__))
         elif isinstance(kallable, staticmethod):
-            return staticmethod(track_func(level, static=True)(kallable.__func__))
+            return staticmethod(track_func(level, static=True, sample=sample, stats=stats)(kallable.__func__))
         elif isinstance(kallable, property):
             return property(
-                kallable.fget and track_func(level, prop=True, prop_type="fget")(kallable.fget) or None,
-                kallable.fset and track_func(level, prop=True, prop_type="fset")(kallable.fset) or None,
-                kallable.fdel and track_func(level, prop=True, prop_type="fdel")(kallable.fdel) or None,
+                kallable.fget and track_func(level, prop=True, prop_type="fget", sample=sample, stats=stats)(kallable.fget) or None,
+                kallable.fset and track_func(level, prop=True, prop_type="fset", sample=sample, stats=stats)(kallable.fset) or None,
+                kallable.fdel and track_func(level, prop=True, prop_type="fdel", sample=sample, stats=stats)(kallable.fdel) or None,
             )
     return deco  
 
@@ -0,0 +1,153 @@
+# This file is a part of Tarkash
+# Copyright 2015-2024 Rahul Verma
+
+# Website: www.RahulVerma.net
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#   http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+'''
+Scoped log context for log_* calls.
+
+Contexts, a correlation id, a TarkashObject and optionally an invoker can be set for a block of code with **log_context**. Every log_* call made inside the block, directly or from nested calls, picks them up without passing them as arguments.
+
+    with log_context("checkout", correlation_id="order-42", tobj=cart):
+        log_info("Placing order.")  # contexts: checkout, tobj: cart
+
+The scope is kept in a **contextvars.ContextVar**, so each asyncio task sees the scope in which it was created. Threads do not inherit the scope of the thread which starts them; use **bind_log_context** to carry it into a thread or an executor job.
+'''
+
+import contextvars
+import functools
+import inspect
+from typing import Callable
+
+class LogScope:
+    '''
+        Immutable log scope which is current inside a **log_context** block.
+
+        Arguments:
+            contexts: Frozen set of context strings.
+            correlation_id: Correlation id or None.
+            tobj: A TarkashObject or None.
+            invoker: An Invoker or None. If set, log_* calls use it instead of inspecting the stack.
+            previous: The scope (or None) which was current when this scope was entered. It is restored on exit.
+    '''
+    __slots__ = ("contexts", "correlation_id", "tobj", "invoker", "previous")
+
+    def __init__(self, contexts=frozenset(), correlation_id=None, tobj=None, invoker=None, previous=None):
+        self.contexts = contexts
+        self.correlation_id = correlation_id
+        self.tobj = tobj
+        self.invoker = invoker
+        self.previous = previous
+
+    def __repr__(self):
+        return "LogScope(contexts={}, correlation_id={!r}, tobj={!r}, invoker={!r})".format(
+            sorted(self.contexts), self.correlation_id, self.tobj, self.invoker
+        )
+
+# None means no log_context is active, which keeps the check in __log to a single comparison.
+_LOG_SCOPE = contextvars.ContextVar("tarkash_log_scope", default=None)
+
+class log_context:
+    '''
+        Context manager (and decorator) which sets a log scope for a block of code.
+
+        Scopes nest: contexts are added to those of the enclosing scope, whereas correlation id, tobj and invoker, when given, replace those of the enclosing scope.
+
+        Arguments:
+            *contexts: Context strings added to every log_* call in the block.
+            correlation_id: (Optional) Correlation id included in every record of the block.
+            tobj: (Optional) TarkashObject used for log_* calls which do not pass **tobj**.
+            invoker: (Optional) An Invoker, or True to pin the invoker of the **with** statement. Log_* calls in the block then skip stack inspection.
+    '''
+
+    def __init__(self, *contexts: str, correlation_id: str=None, tobj=None, invoker=None):
+        self.__contexts = frozenset(contexts)
+        self.__correlation_id = correlation_id
+        self.__tobj = tobj
+        self.__invoker = invoker
+
+    def __scope(self, invoker):
+        parent = _LOG_SCOPE.get()
+        if parent is None:
+            return LogScope(self.__contexts, self.__correlation_id, self.__tobj, invoker)
+        return LogScope(
+            self.__contexts and parent.contexts | self.__contexts or parent.contexts,
+            parent.correlation_id if self.__correlation_id is None else self.__correlation_id,
+            parent.tobj if self.__tobj is None else self.__tobj,
+            parent.invoker if invoker is None else invoker,
+            parent
+        )
+
+    def __enter__(self) -> LogScope:
+        scope = self.__scope(self.__pinned_invoker())
+        _LOG_SCOPE.set(scope)
+        return scope
+
+    def __exit__(self, *args):
+        # The previous scope is kept in the scope rather than in this instance, which can be shared by threads and asyncio tasks that enter and exit it in any order.
+        scope = _LOG_SCOPE.get()
+        _LOG_SCOPE.set(scope is not None and scope.previous or None)
+        return False
+
+    def __call__(self, func):
+        # As a decorator, the instance is shared by concurrent calls, so each call keeps its own token.
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def ainner(*args, **kwargs):
+                token = _LOG_SCOPE.set(self.__scope(self.__pinned_invoker()))
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    _LOG_SCOPE.reset(token)
+            return ainner
+
+        @functools.wraps(func)
+        def inner(*args, **kwargs):
+            token = _LOG_SCOPE.set(self.__scope(self.__pinned_invoker()))
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _LOG_SCOPE.reset(token)
+        return inner
+
+    def __pinned_invoker(self):
+        if self.__invoker is True:
+            from tarkash.track.stack import Stack
+            # Frames: get_invoker_info <- __pinned_invoker <- __enter__/inner <- caller
+            return Stack.get_invoker_info(3)
+        return self.__invoker
+
+def current_log_scope() -> LogScope:
+    '''
+        Returns the current LogScope or None if no **log_context** is active.
+    '''
+    return _LOG_SCOPE.get()
+
+def bind_log_context(func: Callable) -> Callable:
+    '''
+        Binds the callable to the current log scope.
+
+        The returned callable runs in a copy of the current contextvars context, so that it can be passed to a thread or an executor and still log with the scope of the caller.
+
+        Arguments:
+            func: The callable to be bound.
+    '''
+    ctx = contextvars.copy_context()
+
+    @functools.wraps(func)
+    def inner(*args, **kwargs):
+        # A Context can be entered by only one thread at a time, so each call runs in its own copy.
+        return ctx.copy().run(func, *args, **kwargs)
+    return inner
@@ -0,0 +1,563 @@
+# This file is a part of Tarkash
+# Copyright 2015-2024 Rahul Verma
+
+# Website: www.RahulVerma.net
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#   http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+'''
+Logging handlers used by Tarkash's logging pipeline.
+
+**_RotatingFileHandler** rolls the log file over by size and/or time. Rolled segments are compressed on a background thread and listed in order in a manifest.
+
+**_JsonLinesHandler** is the structured sink, which writes one compact JSON object per record.
+
+In multi-process mode, worker processes send records to the aggregator process with **_WorkerSocketHandler**, as length-prefixed JSON. **_LogAggregator** receives them and passes them to the handlers of the aggregator process. Records are never pickled, as any local process can connect to the aggregator.
+
+In asynchronous mode, the "tarkash" logger has a single **_AsyncHandler** which puts records on a bounded queue. A single writer thread drains the queue and writes records to the console and file handlers in batches. Messages are rendered before records are queued, so that they show arguments as they were at the time of the call.
+'''
+
+import atexit
+import gzip
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import shutil
+import socketserver
+import struct
+import sys
+import threading
+import time
+from collections import deque, namedtuple
+from enum import Enum
+
+from tarkash.track.stack import Invoker
+
+class QueueOverflow(Enum):
+    '''
+        What to do with a record when the asynchronous log queue is full.
+    '''
+
+    BLOCK = "block"
+    '''The logging thread waits till the writer thread makes space.'''
+
+    DROP_OLDEST = "drop_oldest"
+    '''The oldest queued record is discarded.'''
+
+    DROP_NEW = "drop_new"
+    '''The new record is discarded.'''
+
+
+class _BatchedFlushMixin:
+    '''
+        Defers stream flushing of a handler to the end of a batch written by the asynchronous writer.
+    '''
+    _in_batch = False
+
+    def flush(self):
+        if not self._in_batch:
+            super().flush()
+
+
+class _BatchedStreamHandler(_BatchedFlushMixin, logging.StreamHandler):
+    pass
+
+
+class _BatchedFileHandler(_BatchedFlushMixin, logging.FileHandler):
+    pass
+
+
+class _SegmentCompressor:
+    '''
+        Compresses rolled log segments on a single background thread.
+    '''
+
+    def __init__(self):
+        self.__queue = queue.Queue()
+        self.__thread = threading.Thread(target=self.__run, name="tarkash-log-compressor", daemon=True)
+        self.__thread.start()
+
+    def submit(self, path, on_done):
+        '''
+            Compress the file to path.gz and remove it. on_done is called with the compressed path.
+        '''
+        self.__queue.put((path, on_done))
+
+    def __run(self):
+        while True:
+            path, on_done = self.__queue.get()
+            try:
+                gz_path = path + ".gz"
+                with open(path, "rb") as src, gzip.open(gz_path, "wb") as dest:
+                    shutil.copyfileobj(src, dest, 1024 * 1024)
+                os.remove(path)
+                on_done(path, gz_path)
+            except OSError:
+                # The segment stays uncompressed.
+                pass
+            finally:
+                self.__queue.task_done()
+
+    def wait(self):
+        '''
+            Blocks till all submitted segments are compressed.
+        '''
+        self.__queue.join()
+
+
+class _RotatingFileHandler(logging.handlers.BaseRotatingHandler):
+    '''
+        File handler which rolls over the file by size and/or time.
+
+        Rolled segments are named <file>.1, <file>.2 and so on in order of creation. They are gzip compressed on a background thread if compress is True. <file>.manifest.json lists the segments in order, followed by the active file.
+
+        Arguments:
+            path: Path of the log file.
+            mode: File opening mode.
+            encoding: File encoding.
+            max_bytes: Roll over before the first record written after the file reaches this size. 0 disables size-based rollover.
+            interval: Roll over after these many seconds. 0 disables time-based rollover.
+            compress: If True, rolled segments are gzip compressed.
+    '''
+
+    def __init__(self, path, mode="w", encoding="utf-8", *, max_bytes=0, interval=0, compress=True):
+        super().__init__(path, mode, encoding)
+        self.__max_bytes = max_bytes
+        self.__interval = interval
+        self.__compressor = compress and _SegmentCompressor() or None
+        self.__manifest_path = self.baseFilename + ".manifest.json"
+        self.__manifest_lock = threading.RLock()
+        self.__segments = []
+        self.__opened = time.time()
+        self.__next_rollover = interval and self.__opened + interval or None
+        if "w" in mode:
+            self.__remove_stale_segments()
+        self.__write_manifest()
+
+    @property
+    def manifest_path(self):
+        return self.__manifest_path
+
+    def __remove_stale_segments(self):
+        # Segments of a previous run, which are replaced by this run, like the log file itself.
+        try:
+            with open(self.__manifest_path, encoding="utf-8") as f:
+                stale = json.load(f)["segments"]
+        except (OSError, ValueError, KeyError):
+            return
+        log_dir = os.path.dirname(self.baseFilename)
+        for segment in stale:
+            if segment.get("active"):
+                continue
+            try:
+                os.remove(os.path.join(log_dir, segment["file"]))
+            except (OSError, KeyError):
+                pass
+
+    def __write_manifest(self):
+        with self.__manifest_lock:
+            manifest = {
+                "segments": [dict(s) for s in self.__segments] + [
+                    {"file": os.path.basename(self.baseFilename), "opened": self.__opened, "active": True}
+                ]
+            }
+            tmp_path = self.__manifest_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(manifest, f, indent=2)
+            os.replace(tmp_path, self.__manifest_path)
+
+    def shouldRollover(self, record):
+        if self.__next_rollover is not None and record.created >= self.__next_rollover:
+            return True
+        if self.__max_bytes > 0:
+            if self.stream is None:
+                self.stream = self._open()
+            # Checking the current size avoids formatting each record twice.
+            if self.stream.tell() >= self.__max_bytes:
+                return True
+        return False
+
+    def doRollover(self):
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+        closed = time.time()
+        segment_path = "{}.{}".format(self.baseFilename, len(self.__segments) + 1)
+        os.replace(self.baseFilename, segment_path)
+        segment = {"file": os.path.basename(segment_path), "opened": self.__opened, "closed": closed, "compressed": False}
+        with self.__manifest_lock:
+            self.__segments.append(segment)
+        self.__opened = closed
+        if self.__interval:
+            self.__next_rollover = closed + self.__interval
+        self.mode = "w"
+        self.stream = self._open()
+        self.__write_manifest()
+        if self.__compressor is not None:
+            self.__compressor.submit(segment_path, lambda path, gz_path: self.__on_compressed(segment, gz_path))
+
+    def __on_compressed(self, segment, gz_path):
+        with self.__manifest_lock:
+            segment["file"] = os.path.basename(gz_path)
+            segment["compressed"] = True
+            self.__write_manifest()
+
+    def close(self):
+        if self.__compressor is not None:
+            self.__compressor.wait()
+        super().close()
+
+
+class _BatchedRotatingFileHandler(_BatchedFlushMixin, _RotatingFileHandler):
+    pass
+
+
+class _JsonLinesHandler(logging.Handler):
+    '''
+        Writes one compact JSON object per record to a file.
+
+        Lines are buffered in memory and written together when the buffer has batch_size lines, when a record of ERROR or higher level arrives and on flush/close.
+
+        Arguments:
+            path: Path of the file.
+            mode: File opening mode.
+            batch_size: Maximum number of buffered lines.
+    '''
+
+    def __init__(self, path, mode="w", *, batch_size=200):
+        super().__init__()
+        self.__stream = open(path, mode, encoding="utf-8")
+        self.__batch_size = batch_size
+        self.__buffer = []
+
+    @property
+    def stream(self):
+        return self.__stream
+
+    def as_dict(self, record):
+        '''
+            The structured form of a record, which is written as JSON.
+        '''
+        invoker = getattr(record, "invoker", None)
+        entry = {
+            "level": record.levelname,
+            "time": record.created,
+            "invoker": hasattr(invoker, "as_dict") and invoker.as_dict() or {"text": str(invoker)},
+            "contexts": sorted(getattr(record, "contexts", None) or ()),
+            "process": record.process,
+            "correlation_id": getattr(record, "correlation_id", None),
+            "message": record.getMessage(),
+        }
+        tobj = getattr(record, "tobj", None)
+        if tobj is not None:
+            entry["tobj"] = {"class": tobj.class_name, "name": tobj.object_name}
+        return entry
+
+    def format(self, record):
+        return json.dumps(self.as_dict(record), ensure_ascii=False, separators=(",", ":"), default=str)
+
+    def emit(self, record):
+        try:
+            line = self.format(record)
+            self.acquire()
+            try:
+                self.__buffer.append(line)
+                if len(self.__buffer) >= self.__batch_size or record.levelno >= logging.ERROR:
+                    self.__write()
+            finally:
+                self.release()
+        except Exception:
+            self.handleError(record)
+
+    def __write(self):
+        if self.__buffer and self.__stream is not None:
+            self.__buffer.append("")
+            self.__stream.write("\n".join(self.__buffer))
+            self.__buffer.clear()
+            self.__stream.flush()
+
+    def flush(self):
+        self.acquire()
+        try:
+            self.__write()
+        finally:
+            self.release()
+
+    def close(self):
+        self.acquire()
+        try:
+            self.__write()
+            if self.__stream is not None:
+                self.__stream.close()
+                self.__stream = None
+        finally:
+            self.release()
+        super().close()
+
+
+# Light-weight stand-in for a TarkashObject in records sent by a worker process.
+_TObjRef = namedtuple("_TObjRef", "class_name object_name")
+
+
+class _WorkerSocketHandler(logging.handlers.SocketHandler):
+    '''
+        Sends records of a worker process to the aggregator process as length-prefixed JSON.
+
+        The message is rendered in the worker. Invoker, contexts and TarkashObject of the record are sent as plain data, from which **_RecordStreamHandler** recreates them.
+
+        If the aggregator is not reachable, records are dropped and connection is retried with backoff. A warning is written to stderr when the aggregator becomes unreachable.
+    '''
+
+    def __init__(self, host, port):
+        super().__init__(host, port)
+        self.__unreachable = False
+
+    def createSocket(self):
+        super().createSocket()
+        if self.sock is not None:
+            self.__unreachable = False
+        elif not self.__unreachable:
+            # The worker has no other handler, so the warning cannot be logged.
+            self.__unreachable = True
+            sys.stderr.write("Tarkash log worker (PID: {}) cannot connect to the log aggregator at {}:{}. Records are dropped till it is reachable.\n".format(os.getpid(), self.host, self.port))
+
+    def makePickle(self, record):
+        # Named so by SocketHandler. Returns JSON.
+        if record.exc_info:
+            # Sets record.exc_text.
+            self.format(record)
+        d = dict(record.__dict__)
+        d["msg"] = record.getMessage()
+        d["args"] = None
+        d["exc_info"] = None
+        d.pop("message", None)
+        invoker = d.get("invoker")
+        if isinstance(invoker, Invoker):
+            d["invoker"] = {"text": invoker.text, **invoker.as_dict()}
+        elif invoker is not None:
+            d["invoker"] = str(invoker)
+        tobj = d.get("tobj")
+        if tobj is not None:
+            d["tobj"] = {"class_name": tobj.class_name, "object_name": tobj.object_name}
+        if d.get("contexts") is not None:
+            d["contexts"] = sorted(d["contexts"])
+        data = json.dumps(d, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+        return struct.pack(">L", len(data)) + data
+
+
+class _RecordStreamHandler(socketserver.StreamRequestHandler):
+    '''
+        Reads length-prefixed JSON records sent by a worker till it disconnects.
+    '''
+
+    @staticmethod
+    def make_record(data):
+        d = json.loads(data)
+        if type(d) is not dict:
+            raise ValueError("A record must be a JSON object.")
+        invoker = d.get("invoker")
+        if type(invoker) is dict:
+            d["invoker"] = Invoker(invoker["function"], invoker["module"], invoker["file"], invoker["line"], invoker["text"])
+        tobj = d.get("tobj")
+        if type(tobj) is dict:
+            d["tobj"] = _TObjRef(tobj["class_name"], tobj["object_name"])
+        if d.get("contexts") is not None:
+            d["contexts"] = set(d["contexts"])
+        return logging.makeLogRecord(d)
+
+    def handle(self):
+        logger = self.server.logger
+        while True:
+            try:
+                chunk = self.rfile.read(4)
+            except OSError:
+                return
+            if len(chunk) < 4:
+                # The worker disconnected or crashed.
+                return
+            length = struct.unpack(">L", chunk)[0]
+            try:
+                data = self.rfile.read(length)
+            except OSError:
+                return
+            if len(data) < length:
+                # The worker crashed in the middle of a record.
+                return
+            try:
+                record = self.make_record(data)
+            except Exception:
+                continue
+            logger.handle(record)
+
+
+class _LogAggregator(socketserver.ThreadingTCPServer):
+    '''
+        Receives records from worker processes on a localhost socket and passes them to the handlers of a logger.
+
+        Arguments:
+            logger: Logger of the aggregator process.
+    '''
+    daemon_threads = True
+    allow_reuse_address = True
+    # Many workers can connect at the same time.
+    request_queue_size = 128
+
+    def __init__(self, logger):
+        super().__init__(("127.0.0.1", 0), _RecordStreamHandler)
+        self.logger = logger
+        self.__thread = threading.Thread(target=self.serve_forever, kwargs={"poll_interval": 0.2}, name="tarkash-log-aggregator", daemon=True)
+        self.__thread.start()
+
+    @property
+    def address(self):
+        host, port = self.server_address[:2]
+        return "{}:{}".format(host, port)
+
+    def close(self):
+        '''
+            Stops accepting records from workers.
+        '''
+        self.shutdown()
+        self.server_close()
+
+
+class _AsyncHandler(logging.Handler):
+    '''
+        Puts log records on a bounded queue which is drained by a single writer thread.
+
+        Arguments:
+            handlers: Handlers to which the writer thread writes the records.
+            capacity: Maximum number of queued records.
+            overflow: A **QueueOverflow** constant.
+            batch_size: Maximum number of records written before the target handlers are flushed.
+    '''
+    # Renders tracebacks of records before they are queued.
+    __EXC_FORMATTER = logging.Formatter()
+
+    def __init__(self, handlers, *, capacity=10000, overflow=QueueOverflow.BLOCK, batch_size=500):
+        super().__init__(min([h.level for h in handlers]))
+        self.__handlers = tuple(handlers)
+        self.__capacity = capacity
+        self.__overflow = overflow
+        self.__batch_size = batch_size
+        self.__queue = deque()
+        self.__cond = threading.Condition(threading.Lock())
+        self.__dropped = 0
+        self.__writing = False
+        self.__stopped = False
+        self.__writer = threading.Thread(target=self.__drain, name="tarkash-log-writer", daemon=True)
+        self.__writer.start()
+        atexit.register(self.close)
+
+    @property
+    def handlers(self):
+        return self.__handlers
+
+    @property
+    def dropped(self):
+        '''
+            Number of records dropped because of queue overflow.
+        '''
+        return self.__dropped
+
+    def emit(self, record):
+        # Rendered in the logging thread, as QueueHandler.prepare does. Lazy messages and their arguments are not rendered later on the writer thread, by which time the arguments may have changed.
+        try:
+            record.msg = record.getMessage()
+            record.args = None
+            if record.exc_info and not record.exc_text:
+                record.exc_text = self.__EXC_FORMATTER.formatException(record.exc_info)
+        except Exception:
+            self.handleError(record)
+            return
+        with self.__cond:
+            if self.__stopped:
+                return
+            if len(self.__queue) >= self.__capacity:
+                if self.__overflow is QueueOverflow.DROP_NEW:
+                    self.__dropped += 1
+                    return
+                elif self.__overflow is QueueOverflow.DROP_OLDEST:
+                    self.__queue.popleft()
+                    self.__dropped += 1
+                else:
+                    while len(self.__queue) >= self.__capacity and not self.__stopped:
+                        self.__cond.wait()
+            self.__queue.append(record)
+            self.__cond.notify_all()
+
+    def __drain(self):
+        while True:
+            with self.__cond:
+                self.__writing = False
+                self.__cond.notify_all()
+                while not self.__queue and not self.__stopped:
+                    self.__cond.wait()
+                if not self.__queue and self.__stopped:
+                    return
+                batch = [self.__queue.popleft() for _ in range(min(self.__batch_size, len(self.__queue)))]
+                dropped, self.__dropped = self.__dropped, 0
+                self.__writing = True
+                self.__cond.notify_all()
+            if dropped:
+                batch.append(self.__dropped_record(dropped))
+            try:
+                self.__write(batch)
+            except Exception:
+                # The writer thread must survive a failing handler.
+                pass
+
+    def __dropped_record(self, count):
+        record = logging.LogRecord("tarkash", logging.WARNING, __file__, 0, f"Asynchronous log queue overflow. Dropped {count} record(s).", None, None)
+        # Fields otherwise set by the logger's filter, as this record is not logged through the logger.
+        record.invoker = "<log_writer>"
+        record.contexts = {"default"}
+        record.correlation_id = None
+        record.correlation = ""
+        return record
+
+    def __write(self, batch):
+        for handler in self.__handlers:
+            handler._in_batch = True
+            try:
+                for record in batch:
+                    if record.levelno >= handler.level:
+                        handler.handle(record)
+            finally:
+                handler._in_batch = False
+                handler.flush()
+
+    def flush(self):
+        '''
+            Blocks till all queued records are written.
+        '''
+        with self.__cond:
+            while (self.__queue or self.__writing) and self.__writer.is_alive():
+                self.__cond.wait(0.1)
+
+    def close(self):
+        '''
+            Writes all queued records, stops the writer thread and closes the target handlers.
+        '''
+        with self.__cond:
+            if self.__stopped:
+                return
+            self.__stopped = True
+            self.__cond.notify_all()
+        self.__writer.join()
+        for handler in self.__handlers:
+            handler.close()
+        atexit.unregister(self.close)
+        super().close()
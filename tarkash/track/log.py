@@ -33,17 +33,34 @@ Messages generated by the test project as well as Tarkash go to the same log for
 
 These are represented by six different log_* functions.
 
+A log_* call whose level is below the levels of all handlers returns immediately, without formatting the message, resolving the invoker or appending to traces of **tobj**.
+
 **TRACE** has the lowest priority and **FATAL** has the highest priority amongst message levels.
 
 Following Tarkash Options are related to logging:
     * LOG_CONSOLE_LEVEL: Minimum level of logging for a run for displaying log messages on console.
     * LOG_CONSOLE_LEVEL: Minimum level of logging for a run for displaying log messages in Tarkash.log.
-    * LOG_ALLOWED_CONTEXTS: The context strings which determine log messages belonging to which contexts can be displayed and logged.
+    * LOG_ALLOWED_CONTEXTS: Comma-separated context strings which determine log messages belonging to which contexts can be displayed and logged. Messages without contexts are always logged. If not set, messages of all contexts are logged.
+    * LOG_ASYNC: If True, records are written to console and Tarkash.log by a background writer thread.
+    * LOG_QUEUE_CAPACITY: Maximum number of records waiting for the writer thread.
+    * LOG_QUEUE_OVERFLOW: block/drop_oldest/drop_new. Decides what happens to a record when the queue is full.
+    * LOG_ROTATE_SIZE: Size (e.g. 100MB) at which Tarkash.log is rolled over. 0 disables size-based rotation.
+    * LOG_ROTATE_INTERVAL: Number of seconds after which Tarkash.log is rolled over. 0 disables time-based rotation.
+    * LOG_ROTATE_COMPRESS: If True, rolled over segments are gzip compressed on a background thread. Segments are listed in order in tarkash.log.manifest.json.
+    * LOG_MULTIPROCESS: If True, the first process which initialises Tarkash aggregates records sent by its child processes into a single Tarkash.log, tagged with process ids.
+    * LOG_JSON: If True, records are also written as JSON lines to tarkash.jsonl in LOG_DIR.
+    * LOG_JSON_BATCH_SIZE: Number of JSON lines buffered before they are written.
+    * LOG_SAMPLING: Sampling spec (every:N, rate:P, bucket:R or none) applied to log_* calls, per invoker.
+    * LOG_TRACK_SAMPLING: Default sampling spec applied to each callable tracked with @track.
+    * LOG_SAMPLING_SUMMARY_INTERVAL: Minimum number of seconds between summary records of suppressed records.
+
+Contexts, a correlation id and a TarkashObject can also be set for a block of code with **log_context**, instead of passing them to every log_* call. See **tarkash.track.context**.
 '''
 
 import sys
 
 from tarkash.track.stack import Stack
+from tarkash.track.context import _LOG_SCOPE, log_context, bind_log_context, current_log_scope
 from tarkash.type.annotate import *
 
 # This file is a part of Tarkash
@@ -70,16 +87,120 @@ import types
 import inspect
 import functools
 
+from tarkash.track.handler import _AsyncHandler, _BatchedStreamHandler, _BatchedFileHandler, _JsonLinesHandler, QueueOverflow
+from tarkash.track.handler import _RotatingFileHandler, _BatchedRotatingFileHandler
+from tarkash.track.handler import _LogAggregator, _WorkerSocketHandler
+
+# Set by the aggregator process in multi-process mode. Processes which find it in the environment become workers.
+_AGGREGATOR_ENV = "TARKASH_LOG_AGGREGATOR"
+from tarkash.track.sample import SamplingPolicy, SummaryReporter
+
+def _as_bool(value):
+    if type(value) is str:
+        return value.strip().lower() in {"true", "yes", "on", "1"}
+    return bool(value)
+
+__SIZE_UNITS = {"KB": 1024, "MB": 1024 ** 2, "GB": 1024 ** 3, "B": 1}
+
+def _as_size(value):
+    # Size in bytes from an int or a string like 500KB/10MB/1GB.
+    if type(value) is not str:
+        return int(value or 0)
+    value = value.strip().upper()
+    for unit, multiplier in __SIZE_UNITS.items():
+        if value.endswith(unit):
+            return int(float(value[:-len(unit)]) * multiplier)
+    return int(value or 0)
+
+# Lowest level at which at least one handler emits a record. Until the logger is loaded, nothing is skipped.
+_EMIT_LEVEL = logging.NOTSET
+# Recomputes _EMIT_LEVEL for the loaded logger.
+_REFRESH_EMIT_LEVEL = None
+
+class _EmitLevelWatch:
+    '''
+        Refreshes the emit level when a handler is added to or removed from the "tarkash" logger, when the level of one of its handlers is set, and when the level of any logger is set (Logger.manager then clears its cache).
+
+        Methods are replaced on these instances only, not on the logging classes, and are restored by **close**. Handlers added to ancestors of the logger (e.g. by pytest's caplog) are not watched; call **refresh_emit_level** after adding them.
+
+        Arguments:
+            logger: The "tarkash" logger.
+            refresh: Called after each watched change.
+    '''
+
+    def __init__(self, logger, refresh):
+        self.__logger = logger
+        self.__refresh = refresh
+        self.__patched = []
+        self.__patch(logger, "addHandler", self.__watch_handler)
+        self.__patch(logger, "removeHandler", self.__unwatch_handler)
+        self.__patch(logger.manager, "_clear_cache")
+        for handler in logger.handlers:
+            self.__watch_handler(handler)
+
+    def __patch(self, obj, name, before=None):
+        method = getattr(obj, name)
+        refresh = self.__refresh
+
+        @functools.wraps(method)
+        def refreshing(*vargs, **kwargs):
+            before and before(*vargs)
+            method(*vargs, **kwargs)
+            refresh()
+        setattr(obj, name, refreshing)
+        self.__patched.append((obj, name))
+
+    def __watch_handler(self, handler):
+        if (handler, "setLevel") not in self.__patched:
+            self.__patch(handler, "setLevel")
+
+    def __unwatch_handler(self, handler):
+        if (handler, "setLevel") in self.__patched:
+            self.__restore(handler, "setLevel")
+
+    def __restore(self, obj, name):
+        self.__patched.remove((obj, name))
+        obj.__dict__.pop(name, None)
+
+    def close(self):
+        '''
+            Restores the replaced methods.
+        '''
+        for obj, name in list(self.__patched):
+            self.__restore(obj, name)
+
+def refresh_emit_level():
+    '''
+        Recomputes the lowest level at which a handler emits a record of the "tarkash" logger, including handlers of its ancestors as long as propagate is True.
+
+        Changes to handlers of the "tarkash" logger and to levels of loggers are picked up automatically. Call it after adding a handler to, or removing one from, an ancestor (e.g. the root logger), after setting the level of such a handler, or after changing propagate.
+    '''
+    if _REFRESH_EMIT_LEVEL is not None:
+        _REFRESH_EMIT_LEVEL()
+
+# Allowed contexts as per LOG_ALLOWED_CONTEXTS. None means all contexts are allowed.
+_ALLOWED_CONTEXTS = None
+
+# Sampling policies for log_* calls (per invoker) and for tracked callables. None means no sampling.
+_LOG_SAMPLING = None
+_TRACK_SAMPLING = None
+_INVOKER_SAMPLERS = dict()
+_SAMPLING_SUMMARY_INTERVAL = 60
+# Reports suppressed counts of all samplers periodically and on shutdown.
+_SAMPLING_SUMMARIES = SummaryReporter()
+# Incremented whenever sampling configuration is loaded.
+_SAMPLING_VERSION = 0
+# Code objects whose log_* calls are never sampled per invoker e.g. the @track wrapper, which is sampled per callable.
+_UNSAMPLED_CODES = set()
+
 class _InvokerFilter(logging.Filter):
 
     def filter(self, record):
         if not hasattr(record, "invoker"):
             record.invoker = '<no_trace>'
-        from tarkash import Tarkash
-        # if hasattr(record, "contexts"):
-        #     if not record.contexts.intersection(Tarkash._get_allowed_log_contexts()):
-        #         return False
-
+        correlation_id = getattr(record, "correlation_id", None)
+        record.correlation = correlation_id is not None and "CID:{}\t".format(correlation_id) or ""
+        # Contexts are filtered in __log, before the record is created.
         return True
 
 class _Logger:
@@ -90,6 +211,9 @@ class _Logger:
         self.__ref_config = Tarkash.get_ref_config()
         self.__add_trace_level()
         self.__logger = None
+        self.__aggregator = None
+        self.__emit_level_watch = None
+        self.__closed = False
         self.__load()
 
     def __load(self):
@@ -103,23 +227,133 @@ class _Logger:
         fname = "tarkash.log"
         lpath = os.path.join(log_dir, fname)
 
+        log_async = _as_bool(self.__ref_config.value(TarkashOption.LOG_ASYNC))
+        multiprocess = _as_bool(self.__ref_config.value(TarkashOption.LOG_MULTIPROCESS))
+
         logger = logging.getLogger("tarkash")
         logger.addFilter(_InvokerFilter())
         logger.setLevel(logging.TRACE)
-        ch = logging.StreamHandler(sys.stdout)
-        ch.flush = sys.stdout.flush
+        self.__logger = logger
+        global _REFRESH_EMIT_LEVEL
+        _REFRESH_EMIT_LEVEL = self.refresh_emit_level
+        self.__emit_level_watch = _EmitLevelWatch(logger, self.refresh_emit_level)
+
+        if multiprocess and os.environ.get(_AGGREGATOR_ENV):
+            # A worker process. Records are sent to the aggregator, which writes Tarkash.log.
+            self.__load_worker(os.environ[_AGGREGATOR_ENV], min(dl, fl))
+            return
+
+        rotate_size = _as_size(self.__ref_config.value(TarkashOption.LOG_ROTATE_SIZE))
+        rotate_interval = float(self.__ref_config.value(TarkashOption.LOG_ROTATE_INTERVAL) or 0)
+        if rotate_size or rotate_interval:
+            rotation = dict(max_bytes=rotate_size, interval=rotate_interval, compress=_as_bool(self.__ref_config.value(TarkashOption.LOG_ROTATE_COMPRESS)))
+            fh = (log_async and _BatchedRotatingFileHandler or _RotatingFileHandler)(lpath, "w", 'utf-8', **rotation)
+        elif log_async:
+            fh = _BatchedFileHandler(lpath, "w", 'utf-8')
+        else:
+            fh = logging.FileHandler(lpath, "w", 'utf-8')
+        if log_async:
+            ch = _BatchedStreamHandler(sys.stdout)
+        else:
+            ch = logging.StreamHandler(sys.stdout)
+            ch.flush = sys.stdout.flush
         ch.setLevel(dl)
-        fh = logging.FileHandler(lpath, "w", 'utf-8')
         fh.setLevel(fl)
         #f_fmt = logging.Formatter(u'[%(levelname)5s]\t%(asctime)s\t%(pathname)s::%(module)s.%(funcName)s:%(lineno)d\t%(message)s')
-        f_fmt = logging.Formatter(u'[%(levelname)7s]\t%(asctime)s\t%(invoker)s\t%(message)s')
+        if multiprocess:
+            f_fmt = logging.Formatter(u'[%(levelname)7s]\t%(asctime)s\tPID:%(process)d\t%(invoker)s\t%(correlation)s%(message)s')
+        else:
+            f_fmt = logging.Formatter(u'[%(levelname)7s]\t%(asctime)s\t%(invoker)s\t%(correlation)s%(message)s')
         c_fmt = logging.Formatter(u'[LOG] %(message)s')
         ch.setFormatter(c_fmt)
         fh.setFormatter(f_fmt)
-        logger.addHandler(ch)
-        logger.addHandler(fh)
-
-        self.__logger = logger
+        handlers = [ch, fh]
+        if _as_bool(self.__ref_config.value(TarkashOption.LOG_JSON)):
+            jh = _JsonLinesHandler(
+                os.path.join(log_dir, "tarkash.jsonl"), "w", 
+                batch_size=int(self.__ref_config.value(TarkashOption.LOG_JSON_BATCH_SIZE))
+            )
+            jh.setLevel(fl)
+            handlers.append(jh)
+        if log_async:
+            logger.addHandler(_AsyncHandler(
+                handlers,
+                capacity=int(self.__ref_config.value(TarkashOption.LOG_QUEUE_CAPACITY)),
+                overflow=QueueOverflow(str(self.__ref_config.value(TarkashOption.LOG_QUEUE_OVERFLOW)).strip().lower())
+            ))
+        else:
+            for handler in handlers:
+                logger.addHandler(handler)
+
+        if multiprocess:
+            self.__aggregator = _LogAggregator(logger)
+            os.environ[_AGGREGATOR_ENV] = self.__aggregator.address
+            # Forked children inherit the handlers of this process. They become workers instead.
+            os.register_at_fork(after_in_child=functools.partial(self.__load_forked_worker, self.__aggregator.address, min(dl, fl)))
+
+        self.refresh_emit_level()
+        self.__load_sampling()
+        self.__load_allowed_contexts()
+
+    def __load_forked_worker(self, address, level):
+        # The serving thread of the aggregator does not exist in a forked child. Only the listening socket is inherited, and is closed.
+        aggregator, self.__aggregator = self.__aggregator, None
+        if aggregator is not None:
+            aggregator.server_close()
+        self.__load_worker(address, level)
+
+    def __load_worker(self, address, level):
+        logger = self.__logger
+        for handler in list(logger.handlers):
+            logger.removeHandler(handler)
+        host, port = address.rsplit(":", 1)
+        sh = _WorkerSocketHandler(host, int(port))
+        sh.setLevel(level)
+        logger.addHandler(sh)
+        self.refresh_emit_level()
+        self.__load_sampling()
+        self.__load_allowed_contexts()
+
+    def __load_allowed_contexts(self):
+        from tarkash.core.constant import TarkashOption
+        global _ALLOWED_CONTEXTS
+        allowed = self.__ref_config.value(TarkashOption.LOG_ALLOWED_CONTEXTS)
+        if type(allowed) is str:
+            allowed = allowed.split(",")
+        allowed = frozenset(c.strip() for c in allowed or () if c.strip())
+        _ALLOWED_CONTEXTS = allowed or None
+
+    def __load_sampling(self):
+        from tarkash.core.constant import TarkashOption
+        global _LOG_SAMPLING, _TRACK_SAMPLING, _SAMPLING_SUMMARY_INTERVAL, _SAMPLING_VERSION
+        _SAMPLING_SUMMARY_INTERVAL = float(self.__ref_config.value(TarkashOption.LOG_SAMPLING_SUMMARY_INTERVAL))
+        _LOG_SAMPLING = SamplingPolicy.parse(self.__ref_config.value(TarkashOption.LOG_SAMPLING))
+        _TRACK_SAMPLING = SamplingPolicy.parse(self.__ref_config.value(TarkashOption.LOG_TRACK_SAMPLING))
+        _INVOKER_SAMPLERS.clear()
+        # In a forked worker, the reporting thread of the parent does not exist.
+        _SAMPLING_SUMMARIES.reset()
+        _SAMPLING_VERSION += 1
+
+    def refresh_emit_level(self):
+        '''
+            Recompute the lowest level at which any handler emits a record of the logger. As in Logger.callHandlers, handlers of ancestors are included as long as propagate is True.
+
+            It is called automatically when a handler is added to or removed from the logger, and when the level of any logger or of a handler of the logger is set. See **refresh_emit_level** of this module for other changes.
+        '''
+        global _EMIT_LEVEL
+        logger = self.__logger
+        if logger is None or self.__closed:
+            return
+        handler_levels = []
+        current = logger
+        while current is not None:
+            handler_levels.extend(h.level for h in current.handlers)
+            if not current.propagate:
+                break
+            current = current.parent
+        if not handler_levels and logging.lastResort is not None:
+            handler_levels.append(logging.lastResort.level)
+        _EMIT_LEVEL = max(logger.getEffectiveLevel(), handler_levels and min(handler_levels) or logging.NOTSET)
 
     def __add_trace_level(self):
         logging.TRACE = logging.DEBUG - 5
@@ -134,19 +368,136 @@ class _Logger:
     def logger(self):
         return self.__logger
 
+    def shutdown(self):
+        '''
+            Writes pending records and closes all handlers of the logger.
+        '''
+        global _EMIT_LEVEL, _REFRESH_EMIT_LEVEL
+        # Reports the end of bursts of suppressed records.
+        _SAMPLING_SUMMARIES.flush()
+        _SAMPLING_SUMMARIES.reset()
+        self.__closed = True
+        if self.__aggregator is not None:
+            self.__aggregator.close()
+            # Processes started after shutdown must not try to connect to the closed aggregator.
+            if os.environ.get(_AGGREGATOR_ENV) == self.__aggregator.address:
+                del os.environ[_AGGREGATOR_ENV]
+            self.__aggregator = None
+        if self.__emit_level_watch is not None:
+            self.__emit_level_watch.close()
+            self.__emit_level_watch = None
+        _REFRESH_EMIT_LEVEL = None
+        for handler in list(self.__logger.handlers):
+            self.__logger.removeHandler(handler)
+            handler.close()
+        # Nothing is emitted after shutdown.
+        _EMIT_LEVEL = logging.FATAL + 1
+
+
+_TRACE = logging.DEBUG - 5
+_DEBUG = logging.DEBUG
+_INFO = logging.INFO
+_WARNING = logging.WARNING
+_ERROR = logging.ERROR
+_FATAL = logging.FATAL
+
+_LEVEL_NUMBERS = {
+    "trace": _TRACE,
+    "debug": _DEBUG,
+    "info": _INFO,
+    "warning": _WARNING,
+    "error": _ERROR,
+    "fatal": _FATAL,
+}
+
+class LazyMessage:
+    '''
+        A log message which is rendered only when a handler formats the record.
+
+        The format string is formatted with the given arguments on first conversion to string and the result is cached. Arguments can themselves be lazy objects which render on formatting.
 
-def __log(invoker, level, *msg, contexts=None, tobj=None):
+        Arguments:
+            fmt: A format string as per **str.format**.
+            *args: Arguments for the format string.
+    '''
+    __slots__ = ("_fmt", "_args", "_rendered")
+
+    def __init__(self, fmt, *args):
+        self._fmt = fmt
+        self._args = args
+        self._rendered = None
+
+    def __str__(self):
+        if self._rendered is None:
+            self._rendered = self._fmt.format(*self._args).replace('\n', ' ').replace('\r', '')
+        return self._rendered
+
+def __sample(level):
+    # Frames: __sample <- __log <- log_* <- caller
+    frame = sys._getframe(3)
+    code = frame.f_code
+    if code in _UNSAMPLED_CODES:
+        return True
+    key = (code, frame.f_lineno)
+    sampler = _INVOKER_SAMPLERS.get(key)
+    if sampler is None:
+        sampler = _INVOKER_SAMPLERS.setdefault(key, _LOG_SAMPLING.new_sampler(_SAMPLING_SUMMARY_INTERVAL))
+        _SAMPLING_SUMMARIES.register(sampler, functools.partial(__report_suppressed, level, _LOG_SAMPLING.spec, Stack.get_invoker_info(4)), _SAMPLING_SUMMARY_INTERVAL)
+    allowed, suppressed = sampler.sample()
+    if suppressed:
+        __report_suppressed(level, _LOG_SAMPLING.spec, Stack.get_invoker_info(4), suppressed)
+    return allowed
+
+def __report_suppressed(level, spec, invoker, suppressed):
+    from tarkash import Tarkash
+    Tarkash.get_logger().log(
+        _LEVEL_NUMBERS[level], 
+        f"Sampling ({spec}) suppressed {suppressed} record(s) from this invoker.", 
+        extra={'invoker': invoker, 'contexts': {"default"}}
+    )
+
+def __log(level, *msg, contexts=None, tobj=None):
+    scope = _LOG_SCOPE.get()
+    if scope is not None and scope.contexts:
+        if contexts is None:
+            contexts = scope.contexts
+        elif type(contexts) is str:
+            contexts = scope.contexts | {contexts}
+        else:
+            contexts = scope.contexts.union(contexts)
+    # Messages without contexts are always logged.
+    if _ALLOWED_CONTEXTS is not None and contexts is not None:
+        if type(contexts) is str:
+            if contexts not in _ALLOWED_CONTEXTS:
+                return
+        elif _ALLOWED_CONTEXTS.isdisjoint(contexts):
+            return
     from tarkash import Tarkash
+    if _LOG_SAMPLING is not None and not __sample(level):
+        return
+    correlation_id = None
+    if scope is None or scope.invoker is None:
+        # Frames: get_invoker_info <- __log <- log_* <- caller
+        invoker = Stack.get_invoker_info(3)
+    else:
+        invoker = scope.invoker
+    if scope is not None:
+        correlation_id = scope.correlation_id
+        if tobj is None:
+            tobj = scope.tobj
     if type(contexts) is str:
         contexts = (contexts,)
     elif contexts is None:
         contexts = ("default",)
     contexts = set(contexts)
     try:
-        msg = " ".join([str(m).replace('\n', ' ').replace('\r', '') for m in msg])
+        if len(msg) == 1 and type(msg[0]) is LazyMessage:
+            msg = msg[0]
+        else:
+            msg = " ".join([str(m).replace('\n', ' ').replace('\r', '') for m in msg])
         if tobj is not None:
-            tobj.append_trace(msg)
-        getattr(Tarkash.get_logger(), level)(msg, extra={'invoker': invoker, 'contexts':contexts})
+            tobj.append_trace(str(msg), _LEVEL_NUMBERS[level])
+        getattr(Tarkash.get_logger(), level)(msg, extra={'invoker': invoker, 'contexts':contexts, 'tobj': tobj, 'correlation_id': correlation_id})
     except AttributeError as e:
         import traceback
         traceback.print_exc()
@@ -156,9 +507,9 @@ def __log(invoker, level, *msg, contexts=None, tobj=None):
     except OSError:
         ## On Windows 10, random handle related bugs happen.
         if level.lower() in {"info", "debug", "trace"} :
-            sys.stdout.write(msg+ "\n")
+            sys.stdout.write(str(msg) + "\n")
         else :
-            sys.stderr.write(msg+"\n")
+            sys.stderr.write(str(msg) + "\n")
 
 def log_trace(*msg: object, contexts: ListOrTupleOrStr=None, tobj=None):
     '''
@@ -167,8 +518,10 @@ def log_trace(*msg: object, contexts: ListOrTupleOrStr=None, tobj=None):
         Args: 
             msg: Arbitrary Log Message Objects. String representations of all objects are joined using a single blank space.
             contexts: (Optional) Context strings for this log message.
+            tobj: A TarkashObject. If provided and the message is emitted, it is appended to traces of this object.
     '''
-    __log(Stack.get_invoker(), "trace", *msg, contexts=contexts, tobj=tobj)
+    if _TRACE < _EMIT_LEVEL: return
+    __log("trace", *msg, contexts=contexts, tobj=tobj)
 
 def log_debug(*msg: object, contexts: ListOrTupleOrStr=None, tobj=None) -> None:
     '''
@@ -177,9 +530,10 @@ def log_debug(*msg: object, contexts: ListOrTupleOrStr=None, tobj=None) -> None:
         Args: 
             msg: Arbitrary Log Message Objects. String representations of all objects are joined using a single blank space.
             contexts: (Optional) Context strings for this log message.
-            tobj: A TarkashObject. If provided, the message is appended to traces of this object.
+            tobj: A TarkashObject. If provided and the message is emitted, it is appended to traces of this object.
     '''
-    __log(Stack.get_invoker(), "debug", *msg, contexts=contexts, tobj=tobj)
+    if _DEBUG < _EMIT_LEVEL: return
+    __log("debug", *msg, contexts=contexts, tobj=tobj)
 
 def log_info(*msg: object, contexts: ListOrTupleOrStr=None, tobj=None) -> None:
     '''
@@ -188,9 +542,10 @@ def log_info(*msg: object, contexts: ListOrTupleOrStr=None, tobj=None) -> None:
         Args: 
             msg: Arbitrary Log Message Objects. String representations of all objects are joined using a single blank space.
             contexts: (Optional) Context strings for this log message.
-            tobj: A TarkashObject. If provided, the message is appended to traces of this object.
+            tobj: A TarkashObject. If provided and the message is emitted, it is appended to traces of this object.
     '''
-    __log(Stack.get_invoker(), "info", *msg, contexts=contexts, tobj=tobj)
+    if _INFO < _EMIT_LEVEL: return
+    __log("info", *msg, contexts=contexts, tobj=tobj)
 
 def log_warning(*msg: object, contexts: ListOrTupleOrStr=None, tobj=None) -> None:
     '''
@@ -199,9 +554,10 @@ def log_warning(*msg: object, contexts: ListOrTupleOrStr=None, tobj=None) -> Non
         Args: 
             msg: Arbitrary Log Message Objects. String representations of all objects are joined using a single blank space.
             contexts: (Optional) Context strings for this log message.
-            tobj: A TarkashObject. If provided, the message is appended to traces of this object.
+            tobj: A TarkashObject. If provided and the message is emitted, it is appended to traces of this object.
     '''
-    __log(Stack.get_invoker(), "warning", *msg, contexts=contexts, tobj=tobj)
+    if _WARNING < _EMIT_LEVEL: return
+    __log("warning", *msg, contexts=contexts, tobj=tobj)
 
 def log_error(*msg: object, contexts: ListOrTupleOrStr=None, tobj=None) -> None:
     '''
@@ -210,9 +566,10 @@ def log_error(*msg: object, contexts: ListOrTupleOrStr=None, tobj=None) -> None:
         Args: 
             msg: Arbitrary Log Message Objects. String representations of all objects are joined using a single blank space.
             contexts: (Optional) Context strings for this log message.
-            tobj: A TarkashObject. If provided, the message is appended to traces of this object.
+            tobj: A TarkashObject. If provided and the message is emitted, it is appended to traces of this object.
     '''
-    __log(Stack.get_invoker(), "error", *msg, contexts=contexts, tobj=tobj)
+    if _ERROR < _EMIT_LEVEL: return
+    __log("error", *msg, contexts=contexts, tobj=tobj)
 
 def log_fatal(*msg: object, contexts: ListOrTupleOrStr=None, tobj=None) -> None:
     '''
@@ -221,6 +578,7 @@ def log_fatal(*msg: object, contexts: ListOrTupleOrStr=None, tobj=None) -> None:
         Args: 
             msg: Arbitrary Log Message Objects. String representations of all objects are joined using a single blank space.
             contexts: (Optional) Context strings for this log message.
-            tobj: A TarkashObject. If provided, the message is appended to traces of this object.
+            tobj: A TarkashObject. If provided and the message is emitted, it is appended to traces of this object.
     '''
-    __log(Stack.get_invoker(), "fatal", *msg, contexts=contexts, tobj=tobj)
\ No newline at end of file
+    if _FATAL < _EMIT_LEVEL: return
+    __log("fatal", *msg, contexts=contexts, tobj=tobj)
\ No newline at end of file
@@ -0,0 +1,245 @@
+# This file is a part of Tarkash
+# Copyright 2015-2024 Rahul Verma
+
+# Website: www.RahulVerma.net
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#   http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+'''
+Sampling and rate limiting of log records.
+
+A sampling policy is described by a string spec:
+    * **every:N** - Emit every Nth record.
+    * **rate:P** - Emit a record with probability P (0 to 1).
+    * **bucket:R** - Token bucket. Emit at most R records per second, with bursts of up to R records.
+    * **none** - No sampling.
+
+Each sampler counts the records it suppresses. The count is reported in a summary record at most once every summary interval, when a later record is sampled. **SummaryReporter** also reports pending counts periodically and when logging shuts down, so that the end of a burst is reported.
+'''
+
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+
+class Sampler(ABC):
+    '''
+        Base class for samplers.
+
+        Arguments:
+            summary_interval: Minimum number of seconds between two summaries of suppressed records.
+    '''
+
+    def __init__(self, summary_interval: float=60):
+        self.__lock = threading.Lock()
+        self.__summary_interval = summary_interval
+        self.__suppressed = 0
+        self.__last_summary = time.monotonic()
+
+    @abstractmethod
+    def _allow(self) -> bool:
+        pass
+
+    def sample(self):
+        '''
+            Decide whether the current record is emitted.
+
+            Returns:
+                A tuple (allowed, suppressed). **suppressed** is the number of records to be reported in a summary now, else 0.
+        '''
+        with self.__lock:
+            allowed = self._allow()
+            if not allowed:
+                self.__suppressed += 1
+            suppressed = 0
+            if self.__suppressed:
+                now = time.monotonic()
+                if now - self.__last_summary >= self.__summary_interval:
+                    suppressed, self.__suppressed = self.__suppressed, 0
+                    self.__last_summary = now
+            return allowed, suppressed
+
+    def take_summary(self, force: bool=False) -> int:
+        '''
+            Takes the number of suppressed records to be reported now, and resets it.
+
+            Arguments:
+                force: If True, the number is taken even if the summary interval has not passed since the last summary.
+
+            Returns:
+                Number of suppressed records to be reported, else 0.
+        '''
+        with self.__lock:
+            if not self.__suppressed:
+                return 0
+            now = time.monotonic()
+            if not force and now - self.__last_summary < self.__summary_interval:
+                return 0
+            suppressed, self.__suppressed = self.__suppressed, 0
+            self.__last_summary = now
+            return suppressed
+
+
+class SummaryReporter:
+    '''
+        Reports pending counts of suppressed records of registered samplers, every summary interval on a background thread, and on **flush**.
+    '''
+
+    def __init__(self):
+        self.__reports = dict()
+        self.__lock = threading.Lock()
+        self.__stop = None
+        self.__thread = None
+
+    def register(self, sampler: Sampler, report, interval: float):
+        '''
+            Registers a sampler. The reporting thread is started on the first registration.
+
+            Arguments:
+                sampler: A **Sampler**.
+                report: Callable which logs a summary. It is called with the number of suppressed records.
+                interval: Number of seconds between two checks of pending counts.
+        '''
+        self.__reports[sampler] = report
+        if self.__thread is None:
+            with self.__lock:
+                if self.__thread is None:
+                    stop = self.__stop = threading.Event()
+                    self.__thread = threading.Thread(target=self.__run, args=(stop, max(interval, 0.1)), name="tarkash-sampling-summary", daemon=True)
+                    self.__thread.start()
+
+    def __run(self, stop, interval):
+        while not stop.wait(interval):
+            self.flush(force=False)
+
+    def flush(self, force: bool=True):
+        '''
+            Reports pending counts of suppressed records.
+
+            Arguments:
+                force: If False, counts are reported only for samplers whose summary interval has passed.
+        '''
+        for sampler, report in list(self.__reports.items()):
+            suppressed = sampler.take_summary(force)
+            if suppressed:
+                report(suppressed)
+
+    def reset(self):
+        '''
+            Stops the reporting thread and forgets registered samplers, without reporting their pending counts.
+        '''
+        with self.__lock:
+            if self.__stop is not None:
+                self.__stop.set()
+            self.__stop = None
+            self.__thread = None
+            self.__reports = dict()
+
+
+class EveryNthSampler(Sampler):
+
+    def __init__(self, n: int, **kwargs):
+        super().__init__(**kwargs)
+        if n < 1:
+            raise ValueError(f"every:N sampling needs N >= 1. Got >>{n}<<.")
+        self.__n = n
+        self.__count = 0
+
+    def _allow(self):
+        self.__count += 1
+        if self.__count >= self.__n:
+            self.__count = 0
+        return self.__count == 1 or self.__n == 1
+
+
+class ProbabilisticSampler(Sampler):
+
+    def __init__(self, rate: float, **kwargs):
+        super().__init__(**kwargs)
+        if not 0 <= rate <= 1:
+            raise ValueError(f"rate:P sampling needs 0 <= P <= 1. Got >>{rate}<<.")
+        self.__rate = rate
+
+    def _allow(self):
+        return random.random() < self.__rate
+
+
+class TokenBucketSampler(Sampler):
+
+    def __init__(self, per_second: float, **kwargs):
+        super().__init__(**kwargs)
+        if per_second <= 0:
+            raise ValueError(f"bucket:R sampling needs R > 0. Got >>{per_second}<<.")
+        self.__rate = per_second
+        self.__capacity = max(per_second, 1)
+        self.__tokens = self.__capacity
+        self.__last = time.monotonic()
+
+    def _allow(self):
+        now = time.monotonic()
+        self.__tokens = min(self.__capacity, self.__tokens + (now - self.__last) * self.__rate)
+        self.__last = now
+        if self.__tokens >= 1:
+            self.__tokens -= 1
+            return True
+        return False
+
+
+class SamplingPolicy:
+    '''
+        Creates samplers as per a string spec.
+
+        Arguments:
+            spec: Sampling spec e.g. **every:100**, **rate:0.01**, **bucket:50** or **none**.
+    '''
+
+    __SAMPLERS = {
+        "every": (EveryNthSampler, int),
+        "rate": (ProbabilisticSampler, float),
+        "bucket": (TokenBucketSampler, float),
+    }
+
+    def __init__(self, spec: str):
+        self.__spec = spec.strip().lower()
+        try:
+            kind, value = self.__spec.split(":")
+            self.__sampler_class, converter = self.__SAMPLERS[kind.strip()]
+            self.__value = converter(value.strip())
+        except (ValueError, KeyError):
+            raise ValueError(f"Invalid sampling spec >>{spec}<<. Expected every:N, rate:P, bucket:R or none.")
+        # Validates the value.
+        self.new_sampler()
+
+    @classmethod
+    def parse(cls, spec):
+        '''
+            Returns a SamplingPolicy for the spec, or None if spec is empty or **none**.
+        '''
+        if spec is None or isinstance(spec, SamplingPolicy):
+            return spec
+        if not str(spec).strip() or str(spec).strip().lower() == "none":
+            return None
+        return cls(str(spec))
+
+    @property
+    def spec(self):
+        return self.__spec
+
+    def new_sampler(self, summary_interval: float=60) -> Sampler:
+        '''
+            Creates a new sampler as per this policy.
+
+            Args:
+                summary_interval: Minimum number of seconds between two summaries of suppressed records.
+        '''
+        return self.__sampler_class(self.__value, summary_interval=summary_interval)
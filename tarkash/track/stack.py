@@ -18,11 +18,102 @@
 import time
 import inspect
 import os
+import sys
+
+class Invoker:
+    '''
+        Invoker of a log call.
+
+        Its string representation is the formatted "Function/Method ... Module ... Line" text used in Tarkash.log.
+    '''
+    __slots__ = ("function", "module", "file", "line", "text")
+
+    def __init__(self, function, module, file, line, text):
+        self.function = function
+        self.module = module
+        self.file = file
+        self.line = line
+        self.text = text
+
+    def __reduce__(self):
+        return (Invoker, (self.function, self.module, self.file, self.line, self.text))
+
+    def as_dict(self):
+        return {"function": self.function, "module": self.module, "file": self.file, "line": self.line}
+
+    def __str__(self):
+        return self.text
+
+_NO_TRACE = Invoker(None, None, None, None, "<no_trace>")
 
 class Stack:
+    '''
+        Resolves the invoker of a log call by walking frames directly.
+
+        Invokers are cached per (code object, line number), so repeated calls from the same line cost a single frame lookup.
+    '''
+
+    _CACHE_LIMIT = 10000
+    __cache = dict()
 
     @classmethod
-    def get_invoker(cls):
+    def get_invoker(cls, depth=2):
+        '''
+            Returns a formatted string describing the invoker.
+
+            Args:
+                depth: Number of frames to skip, counted from the caller of this method. Default of 2 refers to the caller of the function which called get_invoker.
+        '''
+        return cls.get_invoker_info(depth + 1).text
+
+    @classmethod
+    def get_invoker_info(cls, depth=2):
+        '''
+            Returns an **Invoker** object describing the invoker.
+
+            Args:
+                depth: Number of frames to skip, counted from the caller of this method. Default of 2 refers to the caller of the function which called get_invoker_info.
+        '''
+        try:
+            frame = sys._getframe(depth)
+        except ValueError:
+            return _NO_TRACE
+        code = frame.f_code
+        key = (code, frame.f_lineno)
+        try:
+            return cls.__cache[key]
+        except KeyError:
+            pass
+        invoker = cls.__create(frame, code)
+        if len(cls.__cache) >= cls._CACHE_LIMIT:
+            cls.__cache.clear()
+        cls.__cache[key] = invoker
+        return invoker
+
+    @classmethod
+    def __create(cls, frame, code):
+        mod_globals = frame.f_globals
+        mod_file = code.co_filename
+        mod_name = mod_globals.get("__name__")
+        if mod_name == "__main__":
+            mod_script = "Script:<{}> at ".format(mod_globals.get("__file__", mod_file))
+        else:
+            mod_script = "Module:<{}> File:<{}>".format(os.path.basename(mod_file).split(".")[0], mod_file)
+        func = code.co_name
+        if func == "<module>":
+            func_text = ""
+        else:
+            func_text = "Function/Method: <{}> in ".format(func)
+        text = "{}{}Line: {}".format(func_text, mod_script, frame.f_lineno)
+        return Invoker(func, mod_name, mod_file, frame.f_lineno, text)
+
+    @classmethod
+    def get_invoker_from_stack(cls):
+        '''
+            Returns the invoker using **inspect.stack()**.
+
+            This is the original, considerably slower resolver. It is retained for comparison and debugging.
+        '''
         frame = inspect.stack()[2]
         mod = inspect.getmodule(frame[0])
         mod_file = frame.filename
@@ -0,0 +1,225 @@
+# This file is a part of Tarkash
+# Copyright 2015-2024 Rahul Verma
+
+# Website: www.RahulVerma.net
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#   http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+'''
+Latency statistics for tracked callables.
+
+When enabled, @track records wall clock and CPU time of every call in log-linear histograms, keyed by qualified name of the callable. Each thread records into its own histograms, which are merged when statistics are read. Histograms of threads which have ended are merged into a total and released, so that pools which recycle threads do not grow the registry.
+'''
+
+import json
+import os
+import threading
+from typing import Dict
+
+class LatencyHistogram:
+    '''
+        Log-linear histogram of durations in nanoseconds.
+
+        Every power of 2 is split into 8 buckets, so a percentile is reported within 12.5% of the actual value.
+    '''
+    __slots__ = ("counts", "count", "total", "min", "max")
+
+    _SUB_BUCKET_BITS = 3
+    _SUB_BUCKETS = 1 << _SUB_BUCKET_BITS
+
+    def __init__(self):
+        self.counts = dict()
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    @classmethod
+    def _index(cls, value):
+        if value < cls._SUB_BUCKETS:
+            return value
+        shift = value.bit_length() - 1 - cls._SUB_BUCKET_BITS
+        return ((shift + 1) << cls._SUB_BUCKET_BITS) | ((value >> shift) & (cls._SUB_BUCKETS - 1))
+
+    @classmethod
+    def _bounds(cls, index):
+        if index < cls._SUB_BUCKETS:
+            return index, index
+        shift = (index >> cls._SUB_BUCKET_BITS) - 1
+        lower = (cls._SUB_BUCKETS | (index & (cls._SUB_BUCKETS - 1))) << shift
+        return lower, lower + (1 << shift) - 1
+
+    def record(self, value: int):
+        '''
+            Record a duration in nanoseconds.
+        '''
+        if value < 0:
+            value = 0
+        index = self._index(value)
+        counts = self.counts
+        counts[index] = counts.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def merge(self, other: "LatencyHistogram"):
+        '''
+            Add counts of another histogram to this one.
+        '''
+        for index, count in list(other.counts.items()):
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        if other.max is not None and (self.max is None or other.max > self.max):
+            self.max = other.max
+
+    def percentile(self, p: float) -> float:
+        '''
+            Approximate duration in nanoseconds at the given percentile (0 to 100).
+        '''
+        if not self.count:
+            return None
+        rank = max(1, p / 100 * self.count)
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                lower, upper = self._bounds(index)
+                return min(max((lower + upper) / 2, self.min), self.max)
+        return self.max
+
+    def as_dict(self) -> Dict[str, float]:
+        '''
+            Summary of the histogram in nanoseconds.
+        '''
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else None,
+            "min": self.min,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "max": self.max,
+        }
+
+
+class CallStats:
+    '''
+        Registry of per-callable latency histograms.
+    '''
+
+    _ENABLED = False
+    __REPORT_FILE = "call_stats.json"
+    __local = threading.local()
+    __lock = threading.Lock()
+    # Thread -> its histograms, for threads which were alive when last checked.
+    __thread_stats = dict()
+    # Merged histograms of threads which have ended.
+    __ended_stats = dict()
+
+    @classmethod
+    def configure(cls, *, enabled: bool):
+        '''
+            Enable or disable recording for all tracked callables.
+        '''
+        cls._ENABLED = enabled
+
+    @classmethod
+    def record(cls, qualname: str, wall: int, cpu: int):
+        '''
+            Record wall clock and CPU durations (in nanoseconds) of a call.
+        '''
+        try:
+            stats = cls.__local.stats
+        except AttributeError:
+            stats = cls.__local.stats = dict()
+            with cls.__lock:
+                cls.__release_ended_threads()
+                cls.__thread_stats[threading.current_thread()] = stats
+        try:
+            wall_hist, cpu_hist = stats[qualname]
+        except KeyError:
+            wall_hist, cpu_hist = stats[qualname] = (LatencyHistogram(), LatencyHistogram())
+        wall_hist.record(wall)
+        cpu_hist.record(cpu)
+
+    @staticmethod
+    def __merge_into(merged, stats):
+        for qualname, (wall_hist, cpu_hist) in list(stats.items()):
+            if qualname not in merged:
+                merged[qualname] = (LatencyHistogram(), LatencyHistogram())
+            merged[qualname][0].merge(wall_hist)
+            merged[qualname][1].merge(cpu_hist)
+
+    @classmethod
+    def __release_ended_threads(cls):
+        # Called holding the lock. Histograms of an ended thread are not changed any more.
+        for thread in [t for t in cls.__thread_stats if not t.is_alive()]:
+            cls.__merge_into(cls.__ended_stats, cls.__thread_stats.pop(thread))
+
+    @classmethod
+    def merged(cls) -> Dict[str, tuple]:
+        '''
+            Histograms of all threads, merged per callable, as a dict of qualname -> (wall histogram, cpu histogram).
+        '''
+        merged = dict()
+        with cls.__lock:
+            cls.__release_ended_threads()
+            thread_stats = list(cls.__thread_stats.values())
+            cls.__merge_into(merged, cls.__ended_stats)
+        for stats in thread_stats:
+            cls.__merge_into(merged, stats)
+        return merged
+
+    @classmethod
+    def get(cls) -> Dict[str, dict]:
+        '''
+            Summary of recorded statistics as a dict of qualname -> {"count", "wall", "cpu"}. Durations are in nanoseconds.
+        '''
+        return {
+            qualname: {"count": wall_hist.count, "wall": wall_hist.as_dict(), "cpu": cpu_hist.as_dict()}
+            for qualname, (wall_hist, cpu_hist) in sorted(cls.merged().items())
+        }
+
+    @classmethod
+    def reset(cls):
+        '''
+            Discard all recorded statistics.
+        '''
+        with cls.__lock:
+            for stats in cls.__thread_stats.values():
+                stats.clear()
+            cls.__ended_stats.clear()
+
+    @classmethod
+    def dump(cls, report_dir: str):
+        '''
+            Write the summary as JSON to call_stats.json in the report directory, if anything was recorded.
+
+            Returns:
+                Path of the file, or None if nothing was recorded.
+        '''
+        stats = cls.get()
+        if not stats:
+            return None
+        if not os.path.isdir(report_dir):
+            os.makedirs(report_dir)
+        path = os.path.join(report_dir, cls.__REPORT_FILE)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(stats, f, indent=2)
+        return path
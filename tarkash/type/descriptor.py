@@ -15,97 +15,92 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from tarkash.core.descriptor import _Descriptor
+from tarkash.core.descriptor import _Descriptor, _compile_type_and_range_check, _MISSING, ValidationReport
 
-class DNumber:
+class DNumber(_Descriptor):
 
-    def __init__(self, *, immutable=False, minvalue=None, maxvalue=None):
-        super().__init__()
+    def __init__(self, *, immutable=False, default=_MISSING, minvalue=None, maxvalue=None):
+        super().__init__(default=default)
         self.minvalue = minvalue
         self.maxvalue = maxvalue
         self._immutable = immutable
 
+    def _compile_validator(self):
+        return _compile_type_and_range_check(self, (float, int), 'a number', self.minvalue, self.maxvalue)
+
     def validate(self, value):
-        if not isinstance(value, float) and not isinstance(value, int):
-            self._raise_type_error(value, 'a number')
-        if self.minvalue is not None and value < self.minvalue:
-            raise ValueError(
-                f'Expected {value!r} to be at least {self.minvalue!r}'
-            )
-        if self.maxvalue is not None and value > self.maxvalue:
-            raise ValueError(
-                f'Expected {value!r} to be no more than {self.maxvalue!r}'
-            ) 
+        self._validator(value)
+
 
 class DInt(_Descriptor):
 
-    def __init__(self, *, immutable=False, minvalue=None, maxvalue=None):
-        super().__init__()
+    def __init__(self, *, immutable=False, default=_MISSING, minvalue=None, maxvalue=None):
+        super().__init__(default=default)
         self.minvalue = minvalue
         self.maxvalue = maxvalue
         self._immutable = immutable
 
+    def _compile_validator(self):
+        return _compile_type_and_range_check(self, int, 'an int', self.minvalue, self.maxvalue)
+
     def validate(self, value):
-        if not isinstance(value, int):
-            self._raise_type_error(value, 'an int')
-        if self.minvalue is not None and value < self.minvalue:
-            raise ValueError(
-                f'Expected {value!r} to be at least {self.minvalue!r}'
-            )
-        if self.maxvalue is not None and value > self.maxvalue:
-            raise ValueError(
-                f'Expected {value!r} to be no more than {self.maxvalue!r}'
-            )
-            
+        self._validator(value)
+
+
 class DFloat(_Descriptor):
 
-    def __init__(self, *, immutable=False, minvalue=None, maxvalue=None):
-        super().__init__()
+    def __init__(self, *, immutable=False, default=_MISSING, minvalue=None, maxvalue=None):
+        super().__init__(default=default)
         self.minvalue = minvalue
         self.maxvalue = maxvalue
         self._immutable = immutable
 
+    def _compile_validator(self):
+        return _compile_type_and_range_check(self, float, 'a float', self.minvalue, self.maxvalue)
+
     def validate(self, value):
-        if not isinstance(value, float):
-            self._raise_type_error(value, 'a float')
-        if self.minvalue is not None and value < self.minvalue:
-            raise ValueError(
-                f'Expected {value!r} to be at least {self.minvalue!r}'
-            )
-        if self.maxvalue is not None and value > self.maxvalue:
-            raise ValueError(
-                f'Expected {value!r} to be no more than {self.maxvalue!r}'
-            )
-            
- 
-    
-            
+        self._validator(value)
+
+
 class DString(_Descriptor):
 
-    def __init__(self, *, immutable=False):
-        super().__init__()
+    def __init__(self, *, immutable=False, default=_MISSING):
+        super().__init__(default=default)
         self._immutable = immutable
 
+    def _compile_validator(self):
+        return _compile_type_and_range_check(self, str, 'a string')
+
     def validate(self, value):
-        if not isinstance(value, str):
-            self._raise_type_error(value, 'a string')
-        
+        self._validator(value)
+
+
 class DBoolean(_Descriptor):
 
-    def __init__(self, *, immutable=False):
-        super().__init__()
+    def __init__(self, *, immutable=False, default=_MISSING):
+        super().__init__(default=default)
         self._immutable = immutable
 
+    def _compile_validator(self):
+        return _compile_type_and_range_check(self, bool, 'a bool')
+
     def validate(self, value):
-        if not isinstance(value, bool):
-            self._raise_type_error(value, 'a bool')
-            
+        self._validator(value)
+
+
 class DCallable(_Descriptor):
 
-    def __init__(self, *, immutable=False):
-        super().__init__()
+    def __init__(self, *, immutable=False, default=_MISSING):
+        super().__init__(default=default)
         self._immutable = immutable
 
+    def _compile_validator(self):
+        raise_type_error = self._raise_type_error
+
+        def check(value):
+            if not callable(value):
+                raise_type_error(value, 'a callable for type conversion')
+        return check
+
     def validate(self, value):
-        if not callable(value):
-            self._raise_type_error(value, 'a callable for type conversion')
\ No newline at end of file
+        self._validator(value)
@@ -24,17 +24,143 @@ Contains many general purpose type abstractions.
 import abc
 import pprint
 import random
+import threading
 from collections import OrderedDict, namedtuple
+from collections.abc import Mapping, MutableMapping, KeysView, ItemsView, ValuesView
 from typing import Callable
 from enum import Enum, auto
 
 from tarkash.track.auto import track
 
-class _ArDict(metaclass=abc.ABCMeta):
+KeyCacheInfo = namedtuple("KeyCacheInfo", "hits misses maxsize currsize")
 
-    def __init__(self, d=None):
+class NormalisedKey(str):
+    '''
+        A string key that carries its processed form. Create it with **normalised_key** method of a dictionary of the _ArDict family.
+
+        A dictionary created with a key cache uses the processed form directly when the key is not in the cache, so a hot key is never processed again, even after it is evicted. The processed form is the same string object every time, so its hash is computed only once.
+
+        It is an ordinary string otherwise and can be used with any dictionary.
+    '''
+
+    def __new__(cls, key, processed, space):
+        obj = super().__new__(cls, key)
+        obj.processed = processed
+        obj.space = space
+        return obj
+
+    def __getnewargs__(self):
+        return str(self), self.processed, self.space
+
+class _KeyCache:
+    '''
+        Bounded cache of raw key -> processed key, with hit/miss statistics. The oldest entry is evicted when the cache is full.
+
+        The key processor must always return the same processed key for a given raw key.
+
+        Arguments:
+            process: Callable for processing a key.
+            space: Identity of the key processing. A **NormalisedKey** created for the same space is not processed.
+            maxsize: Maximum number of cached keys.
+    '''
+    __slots__ = ("__process", "__space", "__maxsize", "__entries", "hits", "misses")
+
+    def __init__(self, process, space, maxsize):
+        self.__process = process
+        self.__space = space
+        self.__maxsize = maxsize
+        self.__entries = dict()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def maxsize(self):
+        return self.__maxsize
+
+    def __call__(self, key):
+        entries = self.__entries
+        try:
+            processed = entries[key]
+        except KeyError:
+            # A NormalisedKey equals its raw key, so it is found above while cached, and is not processed even after eviction.
+            if key.__class__ is NormalisedKey and key.space is self.__space:
+                self.hits += 1
+                return key.processed
+        except TypeError:
+            # Unhashable keys are not cached.
+            return self.__process(key)
+        else:
+            self.hits += 1
+            return processed
+        processed = self.__process(key)
+        self.misses += 1
+        if len(entries) >= self.__maxsize:
+            del entries[next(iter(entries))]
+        entries[key] = processed
+        return processed
+
+    def info(self):
+        return KeyCacheInfo(self.hits, self.misses, self.__maxsize, len(self.__entries))
+
+    def clear(self):
+        self.__entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+class _OrigKeysView(KeysView):
+    '''
+        Live view of original keys of an **_ArDict**.
+    '''
+    __slots__ = ()
+
+    def __iter__(self):
+        return iter(self._mapping._key_map.values())
+
+class _OrigItemsView(ItemsView):
+    '''
+        Live view of (original key, value) pairs of an **_ArDict**.
+    '''
+    __slots__ = ()
+
+    def __iter__(self):
+        mapping = self._mapping
+        return zip(mapping._key_map.values(), mapping.store.values())
+
+class _OrigValuesView(ValuesView):
+    '''
+        Live view of values of an **_ArDict**.
+    '''
+    __slots__ = ()
+
+    def __iter__(self):
+        return iter(self._mapping.store.values())
+
+class _ArDict(MutableMapping):
+    '''
+        Base class for dictionaries whose keys are processed (e.g. lower-cased) before storage.
+
+        Values are stored against processed keys in **store**. The first original key used for a processed key is remembered in a key map, which is kept in the same order as **store**, so that keys(), items() and iteration are live views over original keys, without copying.
+
+        Looking up a missing key does not change the dictionary.
+
+        **clone** is O(1): the clone shares storage with this dictionary, and either of them copies it on its first write.
+
+        Arguments:
+            d: (Optional) A **dict**, an **_ArDict** or an iterable of key-value pairs.
+            key_cache_size: (Optional) If more than 0, processed keys are cached for up to these many raw keys. Useful when key processing is expensive.
+    '''
+
+    # True when storage is shared with a clone or with the dictionary this is cloned from.
+    __shared = False
+
+    def __init__(self, d=None, *, key_cache_size=0):
         self.__store = dict()
         self.__key_map = dict()
+        self.__key_cache = None
+        if key_cache_size:
+            # Shadows _process_key for this instance.
+            self.__key_cache = _KeyCache(self._process_key, self._key_space, key_cache_size)
+            self._process_key = self.__key_cache
         if d:
             self.update(d)
 
@@ -46,53 +172,160 @@ class _ArDict(metaclass=abc.ABCMeta):
     def store(self):
         return self.__store
 
-    def __create_orig_dict(self):
-        return {self.__key_map[k]: v for k,v in self.store.items()}
+    @property
+    def _key_map(self):
+        return self.__key_map
 
-    def __process_key_wrapper(self, key):
-        revised_key = self._process_key(key)
-        if revised_key not in self.__key_map:
-            self.__key_map[revised_key] = key
-        return revised_key
+    def __own_storage(self):
+        # Copy on first write.
+        self.__store = self.__store.copy()
+        self.__key_map = self.__key_map.copy()
+        self.__shared = False
+
+    def __create_orig_dict(self):
+        return dict(zip(self.__key_map.values(), self.__store.values()))
 
     @abc.abstractmethod
     def _process_key(self, key):
         pass
 
+    @property
+    def _key_space(self):
+        # Dictionaries of the same class process keys the same way.
+        return self.__class__._process_key
+
+    @property
+    def key_cache_size(self):
+        return self.__key_cache and self.__key_cache.maxsize or 0
+
+    def key_cache_info(self):
+        '''
+            Statistics of the key cache.
+
+            Returns:
+                A **KeyCacheInfo** (hits, misses, maxsize, currsize) or None if the dictionary has no key cache.
+        '''
+        return self.__key_cache and self.__key_cache.info() or None
+
+    def key_cache_clear(self):
+        '''
+            Empties the key cache and resets its statistics.
+        '''
+        if self.__key_cache:
+            self.__key_cache.clear()
+
+    def normalised_key(self, key):
+        '''
+            Creates a **NormalisedKey** for the key, to be reused for repeated access to this and similar dictionaries.
+
+            Arguments:
+                key: The original key.
+        '''
+        return NormalisedKey(key, self._process_key(key), self._key_space)
+
     def __getitem__(self, key):
-        return self.__store[self.__process_key_wrapper(key)]
+        return self.__store[self._process_key(key)]
+
+    def __contains__(self, key):
+        return self._process_key(key) in self.__store
 
-    def pop(self, key):
-        return self.__store.pop(self.__process_key_wrapper(key))
+    def pop(self, key, *default):
+        revised_key = self._process_key(key)
+        if revised_key in self.__store:
+            if self.__shared: self.__own_storage()
+            del self.__key_map[revised_key]
+            return self.__store.pop(revised_key)
+        if default:
+            return default[0]
+        raise KeyError(key)
+
+    def popitem(self):
+        try:
+            revised_key = next(iter(self.__store))
+        except StopIteration:
+            raise KeyError("popitem(): dictionary is empty")
+        if self.__shared: self.__own_storage()
+        return self.__key_map.pop(revised_key), self.__store.pop(revised_key)
 
     def __setitem__(self, key, value):
-        self.__store[self.__process_key_wrapper(key)] = value
+        revised_key = self._process_key(key)
+        if self.__shared: self.__own_storage()
+        if revised_key not in self.__store:
+            self.__key_map[revised_key] = key
+        self.__store[revised_key] = value
 
     def __delitem__(self, key):
-        del self.__store[self.__process_key_wrapper(key)]
+        revised_key = self._process_key(key)
+        if revised_key not in self.__store:
+            raise KeyError(key)
+        if self.__shared: self.__own_storage()
+        del self.__store[revised_key]
+        del self.__key_map[revised_key]
+
+    def clear(self):
+        if self.__shared:
+            self.__store, self.__key_map, self.__shared = dict(), dict(), False
+            return
+        self.__store.clear()
+        self.__key_map.clear()
 
     def _update(self, d):
         if not d: return
-        for k,v in d.items():
-            self[self.__process_key_wrapper(k)] = v
-
-    def update(self, d):
+        if self.__shared: self.__own_storage()
+        store, key_map, process_key = self.__store, self.__key_map, self._process_key
+        if not store and isinstance(d, (dict, _ArDict)):
+            # Bulk load into an empty dictionary, done by dict.update. Falls back to the loop below if processed keys collide.
+            revised_keys = list(map(process_key, d))
+            store.update(zip(revised_keys, d.values()))
+            if len(store) == len(revised_keys):
+                key_map.update(zip(revised_keys, d))
+                return
+            store.clear()
+        # A single loop with local look-ups, without going through __setitem__.
+        for k, v in (hasattr(d, "items") and d.items() or d):
+            revised_key = process_key(k)
+            if revised_key not in store:
+                key_map[revised_key] = k
+            store[revised_key] = v
+
+    def update(self, d=None, /, **kwargs):
         self._update(d)
+        if kwargs:
+            self._update(kwargs)
 
     def has_key(self, key):
-        return self.__process_key_wrapper(key) in self.__store
+        return self._process_key(key) in self.__store
 
     def keys(self):
-        return self.__create_orig_dict().keys()
+        return _OrigKeysView(self)
+
+    def items(self):
+        return _OrigItemsView(self)
+
+    def values(self):
+        return _OrigValuesView(self)
 
     def __getattr__(self, attr):
+        # Looked up in __dict__, as __getattr__ can be called before __init__ (e.g. on unpickling).
+        store = self.__dict__.get("_ArDict__store")
         try:
-            return self.__store[attr]
-        except KeyError:
+            return store[attr]
+        except (KeyError, TypeError):
             raise AttributeError(f"No attribute/key with name {attr}.")
 
     def __len__(self):
-        return len(self.__store.keys())
+        return len(self.__store)
+
+    def __eq__(self, other):
+        # Keys are compared after processing.
+        if isinstance(other, _ArDict):
+            return self.__store is other.store or self.__store == other.store
+        if isinstance(other, Mapping):
+            process_key = self._process_key
+            return len(self) == len(other) and all(
+                process_key(k) in self.__store and self.__store[process_key(k)] == v for k, v in other.items()
+            )
+        return NotImplemented
 
     def __str__(self):
         if not self.__store:
@@ -101,13 +334,27 @@ class _ArDict(metaclass=abc.ABCMeta):
             return str(self.__create_orig_dict())
 
     def __iter__(self):
-        return iter(self.__create_orig_dict())
+        return iter(self.__key_map.values())
 
     def clone(self):
-        return self._clone()
+        '''
+            Creates a copy of this dictionary in O(1).
 
-    def items(self):
-        return self.__create_orig_dict().items()
+            The copy shares storage with this dictionary until either of them is changed.
+        '''
+        clone = self._clone()
+        clone._share_storage(self)
+        return clone
+
+    def _share_storage(self, source):
+        # Replaces storage of this dictionary with the storage of the source dictionary, until either of them is changed.
+        self.__store, self.__key_map = source.__store, source.__key_map
+        self.__shared = source.__shared = True
+
+    @abc.abstractmethod
+    def _clone(self):
+        # Returns an empty dictionary of the same kind, which clone() makes share storage with this dictionary.
+        pass
 
     def is_empty(self):
         return len(self.__store) == 0
@@ -122,18 +369,96 @@ class CIStringDict(_ArDict):
 
         Arguments:
             pydict: (Optional) A **dict** object.
+            key_cache_size: (Optional) Maximum number of raw keys for which lower-cased keys are cached. Default is 0 (no cache).
     '''
-    def __init__(self, pydict={}):
-        super().__init__(pydict)
+    def __init__(self, pydict={}, *, key_cache_size=0):
+        super().__init__(pydict, key_cache_size=key_cache_size)
 
     def _process_key(self, key):
         return key.lower()
 
+    @property
+    def _key_space(self):
+        return CIStringDict._process_key
+
     def _clone(self):
-        return CIStringDict(self._get_orig_dict())
+        return CIStringDict(key_cache_size=self.key_cache_size)
+
+    def freeze(self):
+        '''
+            Creates an immutable snapshot of this dictionary.
+
+            Returns:
+                A **FrozenCIStringDict** object.
+        '''
+        return FrozenCIStringDict(self)
 
     def __str__(self):
         return "CIStringDict: " + super().__str__()
+
+
+class FrozenCIStringDict(_ArDict):
+    '''
+        Immutable dictionary with case-insensitive keys.
+
+        It has no key cache, so reads do not change any state and it can be shared between threads without copies. If all values are hashable, its hash is computed at creation, so that it can be used as a key of a dict or a cache.
+
+        Storage of a **CIStringDict** (or another FrozenCIStringDict) is shared rather than copied. Other dictionaries are processed in O(n).
+
+        Arguments:
+            pydict: (Optional) A **dict**, an **_ArDict** or an iterable of key-value pairs.
+    '''
+
+    def __init__(self, pydict={}):
+        super().__init__()
+        if not (isinstance(pydict, _ArDict) and pydict._key_space is CIStringDict._process_key):
+            pydict = CIStringDict(pydict)
+        self._share_storage(pydict)
+        try:
+            self.__hash = hash(frozenset(self.store.items()))
+        except TypeError:
+            self.__hash = None
+
+    def _process_key(self, key):
+        return key.lower()
+
+    @property
+    def _key_space(self):
+        return CIStringDict._process_key
+
+    def __hash__(self):
+        if self.__hash is None:
+            raise TypeError("FrozenCIStringDict with unhashable values can not be hashed.")
+        return self.__hash
+
+    def __reduce__(self):
+        # Rebuilt rather than restored, as string hashes differ between processes.
+        return FrozenCIStringDict, (self.orig_dict,)
+
+    def __immutable(self, *vargs, **kwargs):
+        raise TypeError("FrozenCIStringDict can not be changed. Use thaw() to get a mutable copy.")
+
+    __setitem__ = __delitem__ = pop = popitem = clear = update = setdefault = __immutable
+
+    def clone(self):
+        return self
+
+    def _clone(self):
+        return self
+
+    def thaw(self):
+        '''
+            Creates a mutable copy of this dictionary in O(1). It shares storage with this dictionary until it is changed.
+
+            Returns:
+                A **CIStringDict** object.
+        '''
+        thawed = CIStringDict()
+        thawed._share_storage(self)
+        return thawed
+
+    def __str__(self):
+        return "FrozenCIStringDict: " + super().__str__()
         
 
 class ProcessedKeyDict(_ArDict):
@@ -143,17 +468,22 @@ class ProcessedKeyDict(_ArDict):
         Arguments:
             processor: A callable for processing the dictionary key.
             pydict: (Optional) A **dict** object.
+            key_cache_size: (Optional) Maximum number of raw keys for which processed keys are cached. Default is 0 (no cache).
     '''
 
-    def __init__(self, *, processor: Callable, pydict: dict={}):
+    def __init__(self, *, processor: Callable, pydict: dict={}, key_cache_size=0):
         self.__processor = processor
-        super().__init__(pydict)
+        super().__init__(pydict, key_cache_size=key_cache_size)
 
     def _process_key(self, key):
         return self.__processor(key)  
 
+    @property
+    def _key_space(self):
+        return self.__processor
+
     def _clone(self):
-        return ProcessedKeyDict(self.__processor, self.__store)  
+        return ProcessedKeyDict(processor=self.__processor, key_cache_size=self.key_cache_size)
 
 @track("trace")
 class OnceOnlyKeyCIStringDict(CIStringDict):
@@ -163,10 +493,11 @@ class OnceOnlyKeyCIStringDict(CIStringDict):
         Arguments:
             processor: A callable for processing the dictionary key.
             pydict: (Optional) A **dict** object.
+            key_cache_size: (Optional) Maximum number of raw keys for which lower-cased keys are cached. Default is 0 (no cache).
     '''
 
-    def __init__(self, d={}):
-        super().__init__(d)
+    def __init__(self, d={}, *, key_cache_size=0):
+        super().__init__(d, key_cache_size=key_cache_size)
 
     def __setitem__(self, key, value):
         if self.has_key(key):
@@ -183,7 +514,89 @@ class OnceOnlyKeyCIStringDict(CIStringDict):
         return super().__iter__()
 
     def _clone(self):
-        return OnceOnlyKeyCIStringDict(self.items())
+        return OnceOnlyKeyCIStringDict(key_cache_size=self.key_cache_size)
+
+
+@track("trace")
+class ConcurrentOnceOnlyKeyCIStringDict(OnceOnlyKeyCIStringDict):
+    '''
+        Thread-safe **OnceOnlyKeyCIStringDict**, to be shared by multiple writer threads.
+
+        Setting a key is atomic: of the threads that set a new key at the same time, exactly one succeeds and the others get the same exception as for a key that is already set. **setdefault** sets the key only if it is not set, without raising.
+
+        Reads do not lock. A write checks for an existing key without locking, then checks again and sets the key holding a lock. The lock is a single one rather than striped, as the store and the key map must be changed in the same order.
+
+        **update** sets keys one by one. Iterating while other threads write can raise RuntimeError, as for a **dict**. Iterate over a **clone** (O(1)) for a consistent snapshot.
+
+        It has no key cache, as the cache is not thread-safe.
+
+        Arguments:
+            d: (Optional) A **dict** object.
+    '''
+
+    def __init__(self, d={}):
+        self.__lock = threading.Lock()
+        super().__init__(d)
+
+    def __setitem__(self, key, value):
+        if self.has_key(key):
+            raise Exception("You can not change the value once set.")
+        with self.__lock:
+            super().__setitem__(key, value)
+
+    def setdefault(self, key, default=None):
+        '''
+            Sets the value for the key if the key is not set. Does not raise an exception if it is.
+
+            Arguments:
+                key: Key
+                default: Value to be set.
+
+            Returns:
+                Value of the key after this call, i.e. either the given value, or the value set earlier by any thread.
+        '''
+        try:
+            return self[key]
+        except KeyError:
+            pass
+        with self.__lock:
+            try:
+                return self[key]
+            except KeyError:
+                super().__setitem__(key, default)
+                return default
+
+    def __delitem__(self, key):
+        with self.__lock:
+            super().__delitem__(key)
+
+    def pop(self, key, *default):
+        with self.__lock:
+            return super().pop(key, *default)
+
+    def popitem(self):
+        with self.__lock:
+            return super().popitem()
+
+    def clear(self):
+        with self.__lock:
+            super().clear()
+
+    def clone(self):
+        # Storage must not be changed while it is being shared.
+        with self.__lock:
+            return super().clone()
+
+    def freeze(self):
+        with self.__lock:
+            return super().freeze()
+
+    def _clone(self):
+        return ConcurrentOnceOnlyKeyCIStringDict()
+
+    def __reduce__(self):
+        # The lock can not be pickled.
+        return self.__class__, (self.orig_dict,)
 
 
 @track("trace")
@@ -0,0 +1,28 @@
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.realpath(__file__)), ".."))
+
+sys.path.insert(0, ROOT)
+os.environ.setdefault("PROJECT_DIR", tempfile.mkdtemp())
+
+@pytest.fixture
+def run_tarkash(tmp_path):
+    '''
+        Returns a function which runs a script in a separate interpreter, as Tarkash and the logging pipeline are initialised once per process.
+
+        The script runs in tmp_path, which is also its PROJECT_DIR, so its log is written to tmp_path/log/tarkash.log. Keyword arguments are added to its environment. The test fails if the script fails.
+    '''
+    def run(script, **env):
+        env = dict(os.environ, PROJECT_DIR=str(tmp_path), PYTHONPATH=ROOT, **env)
+        result = subprocess.run(
+            [sys.executable, "-c", textwrap.dedent(script)], cwd=str(tmp_path), env=env, capture_output=True, text=True, timeout=60
+        )
+        assert result.returncode == 0, result.stdout + result.stderr
+        return result
+    return run
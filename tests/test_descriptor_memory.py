@@ -0,0 +1,36 @@
+import gc
+import tracemalloc
+
+from tarkash.core.tobj import TarkashObject
+from tarkash.type.descriptor import DString, DBoolean
+
+# A smaller version of notebooks/bench/bench_descriptor_memory.py.
+class FileLike(TarkashObject):
+    _path = DString(immutable=True)
+    _try_relative_path = DBoolean(immutable=True)
+    _should_exist = DBoolean(immutable=True)
+
+    def __init__(self, path, *, should_exist=False, try_relative_path=True, **kwargs):
+        super().__init__(**kwargs)
+        self._path = path
+        self._should_exist = should_exist
+        self._try_relative_path = try_relative_path
+
+TOTAL = 50000
+BATCH = 10000
+# Allowed growth between the first and the last batch.
+TOLERANCE = 256 * 1024
+
+def test_descriptors_do_not_keep_instances_alive():
+    tracemalloc.start()
+    try:
+        baseline = None
+        for _ in range(TOTAL // BATCH):
+            for i in range(BATCH):
+                FileLike(f"file_{i}.txt")
+            gc.collect()
+            current, _ = tracemalloc.get_traced_memory()
+            baseline = baseline is None and current or baseline
+    finally:
+        tracemalloc.stop()
+    assert current - baseline <= TOLERANCE
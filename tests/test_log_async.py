@@ -0,0 +1,45 @@
+OVERFLOW = '''
+    from tarkash import Tarkash
+    from tarkash.track.log import log_info
+    Tarkash.init()
+    for i in range(5000):
+        log_info("record", i)
+    Tarkash.shutdown()
+'''
+
+def test_queue_overflow_warning_is_written(tmp_path, run_tarkash):
+    run_tarkash(OVERFLOW, LOG_ASYNC="True", LOG_QUEUE_CAPACITY="5", LOG_QUEUE_OVERFLOW="drop_new", LOG_CONSOLE_LEVEL="WARNING")
+    log = (tmp_path / "log" / "tarkash.log").read_text()
+    assert "<log_writer>\tAsynchronous log queue overflow. Dropped" in log
+
+def test_messages_are_rendered_before_queueing():
+    import logging
+    import threading
+    from tarkash.track.handler import _AsyncHandler
+    from tarkash.track.log import LazyMessage
+
+    release = threading.Event()
+    messages = []
+
+    class Target(logging.Handler):
+        def emit(self, record):
+            release.wait(5)
+            messages.append(record.getMessage())
+
+    rendered_on = []
+
+    class Arg:
+        def __str__(self):
+            rendered_on.append(threading.current_thread())
+            return "arg"
+
+    handler = _AsyncHandler([Target()])
+    # The writer thread blocks on the first record, so the second one stays queued while its argument is changed.
+    handler.handle(logging.makeLogRecord({"msg": "first", "levelno": logging.INFO}))
+    args = ["orig"]
+    handler.handle(logging.makeLogRecord({"msg": LazyMessage("Started with args {} {}", args, Arg()), "levelno": logging.INFO}))
+    args.append("MUTATED")
+    release.set()
+    handler.close()
+    assert messages == ["first", "Started with args ['orig'] arg"]
+    assert rendered_on == [threading.current_thread()]
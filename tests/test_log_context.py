@@ -0,0 +1,31 @@
+import asyncio
+
+from tarkash.track.context import log_context, current_log_scope
+
+CHECKOUT = log_context("checkout")
+
+def test_shared_log_context_in_tasks_exiting_out_of_order():
+    seen = dict()
+
+    async def job(n, delay):
+        with CHECKOUT:
+            await asyncio.sleep(delay)
+            seen[n] = current_log_scope().contexts
+        seen[f"{n} after"] = current_log_scope()
+
+    async def main():
+        await asyncio.gather(job(1, 0.01), job(2, 0.05))
+
+    asyncio.run(main())
+    assert seen == {1: {"checkout"}, 2: {"checkout"}, "1 after": None, "2 after": None}
+
+def test_nested_and_reentered_log_context():
+    with CHECKOUT:
+        with log_context("payment", correlation_id="c1"):
+            with CHECKOUT:
+                assert current_log_scope().contexts == {"checkout", "payment"}
+                assert current_log_scope().correlation_id == "c1"
+            assert current_log_scope().contexts == {"checkout", "payment"}
+        assert current_log_scope().contexts == {"checkout"}
+        assert current_log_scope().correlation_id is None
+    assert current_log_scope() is None
@@ -0,0 +1,51 @@
+ANCESTOR_HANDLERS = '''
+    import logging
+    from tarkash import Tarkash
+    from tarkash.track.log import log_debug, refresh_emit_level
+    Tarkash.init()
+
+    class Capture(logging.Handler):
+        def __init__(self, level):
+            super().__init__(level)
+            self.messages = []
+        def emit(self, record):
+            self.messages.append(record.getMessage())
+
+    tarkash_logger = logging.getLogger("tarkash")
+    log_debug("before")
+    # Added to an ancestor after Tarkash is loaded, as pytest's caplog does.
+    capture = Capture(logging.DEBUG)
+    logging.getLogger().addHandler(capture)
+    refresh_emit_level()
+    log_debug("propagated")
+    tarkash_logger.propagate = False
+    refresh_emit_level()
+    log_debug("not propagated")
+    tarkash_logger.propagate = True
+    capture.setLevel(logging.INFO)
+    refresh_emit_level()
+    log_debug("below level")
+    logging.getLogger().removeHandler(capture)
+    refresh_emit_level()
+
+    # Handlers of the tarkash logger and levels of loggers are watched.
+    own = Capture(logging.DEBUG)
+    tarkash_logger.addHandler(own)
+    log_debug("own handler")
+    own.setLevel(logging.INFO)
+    log_debug("own handler below level")
+    own.setLevel(logging.DEBUG)
+    tarkash_logger.setLevel(logging.INFO)
+    log_debug("logger below level")
+    print(capture.messages, own.messages)
+
+    Tarkash.shutdown()
+    # Nothing of logging is left replaced.
+    assert not {"addHandler", "removeHandler"} & set(vars(tarkash_logger))
+    assert "_clear_cache" not in vars(logging.Logger.manager) and "setLevel" not in vars(own)
+    assert logging.Logger.addHandler.__module__ == "logging"
+'''
+
+def test_handlers_of_ancestors_added_after_load(run_tarkash):
+    result = run_tarkash(ANCESTOR_HANDLERS, LOG_CONSOLE_LEVEL="INFO", LOG_FILE_LEVEL="INFO")
+    assert result.stdout.strip().splitlines()[-1] == "['propagated'] ['own handler']"
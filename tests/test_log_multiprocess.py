@@ -0,0 +1,82 @@
+import os
+
+FORK_WORKER = '''
+    import os, sys, time
+    from tarkash import Tarkash
+    from tarkash.track.log import log_info
+    Tarkash.init()
+    log_info("from aggregator")
+    pid = os.fork()
+    if pid == 0:
+        log_info("from forked worker")
+        Tarkash.shutdown()
+        os._exit(0)
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        done, status = os.waitpid(pid, os.WNOHANG)
+        if done:
+            break
+        time.sleep(0.05)
+    else:
+        os.kill(pid, 9)
+        print("worker did not exit")
+        sys.exit(1)
+    # Gives the aggregator time to receive the record.
+    time.sleep(0.5)
+    Tarkash.shutdown()
+    assert "TARKASH_LOG_AGGREGATOR" not in os.environ
+'''
+
+def test_forked_worker_logs_and_shuts_down(tmp_path, run_tarkash):
+    run_tarkash(FORK_WORKER, LOG_MULTIPROCESS="True")
+    log = (tmp_path / "log" / "tarkash.log").read_text()
+    assert "from aggregator" in log
+    assert "from forked worker" in log
+
+def test_records_are_sent_as_json():
+    import logging
+    import pickle
+    import pytest
+    from tarkash.track.handler import _WorkerSocketHandler, _RecordStreamHandler
+    from tarkash.track.stack import Invoker
+
+    class TObj:
+        class_name = "tests.TObj"
+        object_name = "t1"
+
+    record = logging.LogRecord("tarkash", logging.INFO, __file__, 1, "value: %s", (["a", "b"],), None)
+    record.invoker = Invoker("f", "m", "m.py", 3, "m.f:3")
+    record.contexts = {"default", "api"}
+    record.tobj = TObj()
+    handler = _WorkerSocketHandler("127.0.0.1", 1)
+    data = handler.makePickle(record)[4:]
+    received = _RecordStreamHandler.make_record(data)
+    assert received.getMessage() == "value: ['a', 'b']"
+    assert str(received.invoker) == "m.f:3" and received.invoker.as_dict()["line"] == 3
+    assert received.contexts == {"default", "api"}
+    assert (received.tobj.class_name, received.tobj.object_name) == ("tests.TObj", "t1")
+
+    class Exploit:
+        def __reduce__(self):
+            return (os.system, ("echo pwned",))
+
+    with pytest.raises(ValueError):
+        _RecordStreamHandler.make_record(pickle.dumps(Exploit()))
+
+def test_unreachable_aggregator_is_reported_once(capsys):
+    import logging
+    import socket
+    from tarkash.track.handler import _WorkerSocketHandler
+
+    # A port on which nothing listens.
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    handler = _WorkerSocketHandler("127.0.0.1", port)
+    record = logging.LogRecord("tarkash", logging.INFO, __file__, 1, "lost", None, None)
+    handler.handle(record)
+    handler.retryTime = None
+    handler.handle(record)
+    handler.close()
+    err = capsys.readouterr().err
+    assert err.count("cannot connect to the log aggregator at 127.0.0.1:{}".format(port)) == 1
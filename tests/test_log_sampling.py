@@ -0,0 +1,29 @@
+BURST = '''
+    import os, time
+    from tarkash import Tarkash
+    from tarkash.track.log import log_info
+    Tarkash.init()
+    for i in range(25):
+        log_info("burst", i)
+    time.sleep(float(os.environ["WAIT"]))
+    with open(os.path.join("log", "tarkash.log")) as f:
+        print("before shutdown:", "suppressed 22 record(s)" in f.read())
+    Tarkash.shutdown()
+'''
+
+def run_burst(tmp_path, run_tarkash, interval, wait):
+    result = run_tarkash(
+        BURST, LOG_CONSOLE_LEVEL="WARNING", LOG_SAMPLING="every:10", LOG_SAMPLING_SUMMARY_INTERVAL=str(interval), WAIT=str(wait)
+    )
+    log = (tmp_path / "log" / "tarkash.log").read_text()
+    return result.stdout.strip().splitlines()[-1], log
+
+def test_pending_suppressed_count_is_reported_on_shutdown(tmp_path, run_tarkash):
+    before_shutdown, log = run_burst(tmp_path, run_tarkash, 3600, 0)
+    assert before_shutdown == "before shutdown: False"
+    assert log.count("Sampling (every:10) suppressed 22 record(s) from this invoker.") == 1
+
+def test_pending_suppressed_count_is_reported_periodically(tmp_path, run_tarkash):
+    before_shutdown, log = run_burst(tmp_path, run_tarkash, 0.2, 1)
+    assert before_shutdown == "before shutdown: True"
+    assert log.count("suppressed 22 record(s)") == 1
@@ -0,0 +1,28 @@
+import threading
+
+from tarkash.track.stats import CallStats
+
+def test_stats_of_ended_threads_are_merged_and_released():
+    CallStats.reset()
+
+    def work():
+        for _ in range(10):
+            CallStats.record("tests.work", 1000, 500)
+
+    for _ in range(50):
+        thread = threading.Thread(target=work)
+        thread.start()
+        thread.join()
+    stats = CallStats.get()
+    assert stats["tests.work"]["count"] == 500
+    # Only the threads which are alive keep their own histograms.
+    assert len(CallStats._CallStats__thread_stats) <= threading.active_count()
+    CallStats.reset()
+    assert CallStats.get() == {}
+
+def test_mean_of_zero_durations_is_zero():
+    from tarkash.track.stats import LatencyHistogram
+    histogram = LatencyHistogram()
+    assert histogram.as_dict()["mean"] is None
+    histogram.record(0)
+    assert histogram.as_dict()["mean"] == 0
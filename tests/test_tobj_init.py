@@ -0,0 +1,61 @@
+import pytest
+
+from tarkash.core.tobj import TarkashObject
+from tarkash.type.descriptor import DInt, DString
+
+class Base(TarkashObject, init=True):
+    _x = DInt()
+
+    def __post_init__(self):
+        self.post_init_calls = getattr(self, "post_init_calls", 0) + 1
+
+class Derived(Base, init=True):
+    _y = DInt(default=5)
+
+class Redeclared(Derived, init=True):
+    _x = DInt(minvalue=0)
+    _z = DString()
+
+def test_generated_init_of_subclass_of_generated_init_class():
+    d = Derived(x=1, y=2)
+    assert (d._x, d._y) == (1, 2)
+    assert Derived(3)._y == 5
+    assert d.post_init_calls == 1
+
+def test_generated_init_validates_inherited_fields():
+    with pytest.raises(TypeError, match="_x"):
+        Derived("1")
+
+def test_redeclared_descriptor_is_used_in_subclass():
+    r = Redeclared(1, "z", y=0)
+    assert (r._x, r._y, r._z) == (1, 0, "z")
+    with pytest.raises(ValueError):
+        Redeclared(-1, "z")
+
+def test_clashing_parameter_names():
+    with pytest.raises(TypeError, match="both map to parameter >>x<<"):
+        class Clash(TarkashObject, init=True):
+            _x = DInt()
+            x = DInt()
+
+HAND_WRITTEN_BASE = '''
+    from tarkash import Tarkash
+    from tarkash.file.format import FlatFile
+    from tarkash.type.descriptor import DString
+    Tarkash.init()
+
+    class Tagged(FlatFile, init=True):
+        _tag = DString(default="t")
+
+    tagged = Tagged("tagged.txt")
+    assert (tagged._tag, tagged.content, tagged.should_exist) == ("t", "content", True), tagged
+    tagged = Tagged(path="tagged.txt", tag="x", try_relative_path=True)
+    assert tagged._tag == "x"
+    assert "should_exist" not in Tagged.__init__.__doc__
+    Tarkash.shutdown()
+'''
+
+def test_generated_init_of_subclass_of_hand_written_init_class(tmp_path, run_tarkash):
+    (tmp_path / "tagged.txt").write_text("content")
+    # File objects log, so Tarkash is initialised, in a separate interpreter.
+    run_tarkash(HAND_WRITTEN_BASE, LOG_CONSOLE_LEVEL="WARNING")
@@ -0,0 +1,57 @@
+GENERATORS = '''
+    import asyncio
+    import inspect
+    from tarkash import Tarkash
+    from tarkash.track.auto import track
+    Tarkash.init()
+
+    @track(level="info", stats=True)
+    def numbers(n):
+        total = 0
+        for i in range(n):
+            total += (yield i) or 0
+        return total
+
+    @track(level="info", stats=True)
+    async def anumbers(n):
+        for i in range(n):
+            received = yield i
+            if received:
+                yield received
+
+    # Not tracked, as no handler emits the debug level.
+    @track()
+    def plain(n):
+        yield from range(n)
+
+    @track()
+    async def aplain(n):
+        for i in range(n):
+            yield i
+
+    assert inspect.isgeneratorfunction(numbers) and inspect.isgeneratorfunction(plain)
+    assert inspect.isasyncgenfunction(anumbers) and inspect.isasyncgenfunction(aplain)
+
+    gen = numbers(3)
+    assert (next(gen), gen.send(5), gen.send(6)) == (0, 1, 2)
+    try:
+        gen.send(7)
+        raise AssertionError("Generator did not finish.")
+    except StopIteration as stop:
+        assert stop.value == 18, stop.value
+    assert list(plain(3)) == [0, 1, 2]
+
+    async def run():
+        agen = anumbers(5)
+        assert (await agen.asend(None), await agen.asend("x"), await agen.asend(None)) == (0, "x", 1)
+        await agen.aclose()
+        return [i async for i in aplain(3)]
+    assert asyncio.run(run()) == [0, 1, 2]
+    Tarkash.shutdown()
+'''
+
+def test_tracked_generators_remain_generators(tmp_path, run_tarkash):
+    run_tarkash(GENERATORS, LOG_CONSOLE_LEVEL="WARNING", LOG_FILE_LEVEL="INFO")
+    log = (tmp_path / "log" / "tarkash.log").read_text()
+    assert "numbers:: Finished. Yielded 3 item(s). Returning: 18" in log
+    assert "anumbers:: Closed after yielding 3 item(s)." in log
@@ -0,0 +1,26 @@
+import pytest
+
+from tarkash.type.descriptor import DBoolean, DFloat, DInt
+
+def _scalar_type_errors(descriptor, values):
+    errors = []
+    for index, value in enumerate(values):
+        try:
+            descriptor.validate(value)
+        except TypeError:
+            errors.append(index)
+    return tuple(errors)
+
+@pytest.mark.parametrize("descriptor, dtype", [
+    (DInt(minvalue=0), "int64"), (DInt(minvalue=0), "bool"), (DBoolean(), "bool"),
+    (DFloat(minvalue=0.0), "float64"), (DFloat(minvalue=0.0), "float32"), (DInt(minvalue=0), "object")
+])
+def test_numpy_batch_agrees_with_scalar_validate(descriptor, dtype):
+    numpy = pytest.importorskip("numpy")
+    values = numpy.array([0, 1, 2], dtype=dtype)
+    report = descriptor.validate_batch(values)
+    assert report.type_errors == _scalar_type_errors(descriptor, values)
+
+def test_list_batch_reports_types_and_bounds():
+    report = DInt(minvalue=0, maxvalue=10).validate_batch([1, "2", -1, 11, True])
+    assert (report.type_errors, report.below_min, report.above_max) == ((1,), (2,), (3,))